@@ -1,12 +1,40 @@
+import math
+
 from django.contrib import admin
-from .models import Project, Skill, BlogPost, Contact, SiteConfiguration
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from .archive import archive_path, list_archives, read_archive, record_created_at
+from .changelist import FastChangeListMixin
+from .models import (
+    Project, ProjectTechnology, Technology, Skill, BlogPost, Contact, SiteConfiguration,
+    OutboxMessage,
+)
+
+
+@admin.register(Technology)
+class TechnologyAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+
+
+class ProjectTechnologyInline(admin.TabularInline):
+    model = ProjectTechnology
+    autocomplete_fields = ['technology']
+    extra = 1
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ['title', 'category', 'featured', 'created_at']
-    list_filter = ['category', 'featured', 'created_at']
-    search_fields = ['title', 'description', 'technologies']
+    list_filter = ['category', 'featured', 'created_at', 'technologies']
+    # Searched through the full-text index, which covers these fields
+    search_fields = ['title', 'description', 'technologies__name']
+    search_index_kind = 'project'
+    inlines = [ProjectTechnologyInline]
     list_editable = ['featured']
     prepopulated_fields = {}
 
@@ -20,21 +48,101 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ['title', 'published', 'created_at']
     list_filter = ['published', 'created_at']
     search_fields = ['title', 'content']
+    # Only published posts are indexed; drafts fall back to search_fields
+    search_index_kind = 'blogpost'
+    search_unindexed = Q(published=False)
     list_editable = ['published']
     prepopulated_fields = {'slug': ('title',)}
 
 
 @admin.register(Contact)
-class ContactAdmin(admin.ModelAdmin):
+class ContactAdmin(FastChangeListMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'subject', 'created_at', 'read']
     list_filter = ['read', 'created_at']
-    search_fields = ['name', 'email', 'subject']
+    # Prefix matches, served by the case-insensitive indexes from migration 0009
+    search_fields = ['^name', '^email', '^subject']
     list_editable = ['read']
     readonly_fields = ['created_at']
+    archive_per_page = 100
+    
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path('archive/', self.admin_site.admin_view(self.archive_index_view),
+                 name='%s_%s_archive' % info),
+            path('archive/<str:month>/', self.admin_site.admin_view(self.archive_month_view),
+                 name='%s_%s_archive_month' % info),
+        ] + super().get_urls()
+    
+    def archive_index_view(self, request):
+        """Months archive_contacts has moved out of the table."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': 'Archived contact messages',
+            'archives': list_archives(),
+        }
+        return TemplateResponse(request, 'admin/portfolio/contact/archive_index.html', context)
+    
+    def archive_month_view(self, request, month):
+        """One month's archive, read from its file a page at a time and optionally searched."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            if not archive_path(month).exists():
+                raise Http404('No archive for %s' % month)
+        except ValueError:
+            raise Http404('No archive for %s' % month)
+        query = request.GET.get('q', '').strip()
+        try:
+            page = max(1, int(request.GET.get('p', 1)))
+        except ValueError:
+            page = 1
+        start = (page - 1) * self.archive_per_page
+        messages, matched = [], 0
+        for record in read_archive(month):
+            fields = record['fields']
+            if query and not any(
+                query.lower() in str(fields.get(name, '')).lower()
+                for name in ('name', 'email', 'subject', 'message')
+            ):
+                continue
+            if start <= matched < start + self.archive_per_page:
+                messages.append({**fields, 'pk': record['pk'], 'created_at': record_created_at(record)})
+            matched += 1
+        pages = max(1, math.ceil(matched / self.archive_per_page))
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': 'Archived contact messages: %s' % month,
+            'month': month,
+            'query': query,
+            'archived_messages': messages,
+            'matched': matched,
+            'page': page,
+            'pages': pages,
+            'previous_page': page - 1 if page > 1 else None,
+            'next_page': page + 1 if page < pages else None,
+        }
+        return TemplateResponse(request, 'admin/portfolio/contact/archive_month.html', context)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    readonly_fields = ['created_at', 'sent_at', 'last_error']
+    actions = ['retry_now']
+    
+    @admin.action(description='Retry selected messages now')
+    def retry_now(self, request, queryset):
+        queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
 
 
 @admin.register(SiteConfiguration)
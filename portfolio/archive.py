@@ -0,0 +1,183 @@
+"""
+Archival of old contact messages (``manage.py archive_contacts``).
+
+Read messages older than ``PORTFOLIO_CONTACT_ARCHIVE_DAYS`` move out of the
+Contact table into one gzipped NDJSON file per month,
+``contacts-YYYY-MM.ndjson.gz`` in ``PORTFOLIO_CONTACT_ARCHIVE_DIR``. The
+files use the export_content format, so ``import_content`` can restore a
+month. The table keeps only recent and unread messages, which keeps
+ContactAdmin's list, filter and count queries small; the admin opens an
+archive file only when someone browses that month.
+
+Each month's file is rewritten through a temporary file and renamed into
+place before any row is deleted, and rows already in a file are not written
+again, so an interrupted run can simply be repeated.
+"""
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Contact
+from .transfer import CHUNK_SIZE, dumps, header, queryset_records
+
+
+ARCHIVE_NAME_RE = re.compile(r'^contacts-(\d{4}-\d{2})\.ndjson\.gz$')
+
+MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+
+
+def archive_dir():
+    default = Path(settings.BASE_DIR) / 'var' / 'contact-archive'
+    return Path(getattr(settings, 'PORTFOLIO_CONTACT_ARCHIVE_DIR', default))
+
+
+def archive_days():
+    return getattr(settings, 'PORTFOLIO_CONTACT_ARCHIVE_DAYS', 180)
+
+
+def archive_path(month):
+    if not MONTH_RE.match(month):
+        raise ValueError('Not a YYYY-MM month: %r' % month)
+    return archive_dir() / f'contacts-{month}.ndjson.gz'
+
+
+@dataclass(frozen=True)
+class ArchiveMonth:
+    month: str
+    size: int
+
+    @property
+    def first_day(self):
+        year, month = map(int, self.month.split('-'))
+        return date(year, month, 1)
+
+
+def list_archives():
+    """Archived months, newest first."""
+    months = []
+    if archive_dir().is_dir():
+        for entry in os.scandir(archive_dir()):
+            match = ARCHIVE_NAME_RE.match(entry.name)
+            if match and entry.is_file():
+                months.append(ArchiveMonth(match.group(1), entry.stat().st_size))
+    return sorted(months, key=lambda archive: archive.month, reverse=True)
+
+
+def read_archive(month):
+    """Yield the contact records archived for ``month``, in archive order."""
+    path = archive_path(month)
+    if not path.exists():
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as fh:
+        for line in fh:
+            record = json.loads(line)
+            if record.get('model') == 'contact':
+                yield record
+
+
+def record_created_at(record):
+    """``created_at`` of a record read back from an archive."""
+    return parse_datetime(record['fields']['created_at'])
+
+
+class _MonthWriter:
+    """Copy of a month's archive that new records are appended to, renamed over it by commit()."""
+
+    def __init__(self, month):
+        self.month = month
+        self.path = archive_path(month)
+        self.committed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.archived = set()
+        # Messages are personal data: mkstemp's 0600 is kept
+        fd, self.tmp = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        self.raw = os.fdopen(fd, 'wb')
+        exists = self.path.exists()
+        if exists:
+            self.archived = {record['pk'] for record in read_archive(month)}
+            # gzip members concatenate, so the old file is copied unchanged
+            with open(self.path, 'rb') as old:
+                shutil.copyfileobj(old, self.raw)
+        self.out = gzip.open(self.raw, 'wt', encoding='utf-8')
+        if not exists:
+            self.out.write(dumps(header()) + '\n')
+
+    def write(self, record):
+        if record['pk'] not in self.archived:
+            self.out.write(dumps(record) + '\n')
+            self.archived.add(record['pk'])
+
+    def commit(self):
+        self.out.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+        os.replace(self.tmp, self.path)
+        self.committed = True
+
+    def discard(self):
+        self.out.close()
+        self.raw.close()
+        os.unlink(self.tmp)
+
+
+def archive_contacts(days=None, chunk_size=CHUNK_SIZE, dry_run=False):
+    """
+    Move read messages older than ``days`` (default: the setting) into the
+    monthly archives. Returns a Counter of messages per month.
+    """
+    days = archive_days() if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    queryset = Contact.objects.filter(read=True, created_at__lt=cutoff).order_by('created_at', 'pk')
+    counts = Counter()
+    writer = None
+    moved = []
+    try:
+        for record in queryset_records('contact', queryset, chunk_size):
+            month = timezone.localtime(record['fields']['created_at']).strftime('%Y-%m')
+            counts[month] += 1
+            if dry_run:
+                continue
+            # Rows come oldest first, so each month is written in one go
+            if writer is None or writer.month != month:
+                if writer is not None:
+                    writer.commit()
+                writer = _MonthWriter(month)
+            writer.write(record)
+            moved.append(record['pk'])
+        if writer is not None:
+            writer.commit()
+    except BaseException:
+        if writer is not None and not writer.committed:
+            writer.discard()
+        raise
+
+    # Only now that every file is on disk. A message marked unread since it
+    # was written out no longer matches, and stays in the table.
+    for start in range(0, len(moved), chunk_size):
+        with transaction.atomic():
+            Contact.objects.filter(
+                pk__in=moved[start:start + chunk_size], read=True, created_at__lt=cutoff,
+            ).delete()
+    return counts
+
+
+def vacuum():
+    """Return the space freed by archiving to the filesystem (SQLite only). Returns whether it ran."""
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM')
+    return True
@@ -0,0 +1,100 @@
+"""
+Native async variants of the public views, for ASGI deployments (see
+``PORTFOLIO_ASYNC_VIEWS`` and portfolio_site/asgi.py).
+
+Each one subclasses its sync view and only replaces the request handlers,
+so querysets, templates and context stay shared. Database access goes
+through the async ORM before the response is returned, and the page cache
+and conditional GET mixins switch to their async paths automatically.
+Template rendering is left to Django's handler, which runs it off the
+event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404
+
+from . import views
+from .ingest import get_ingestor
+from .outbox import drain_outbox_soon
+
+
+class AsyncListMixin:
+    """Fetch a ListView's page with the async ORM (via ``apaginate_queryset()``)."""
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.fetched_page = await self.apaginate_queryset(self.object_list, page_size)
+        else:
+            self.object_list = [obj async for obj in self.object_list]
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        # Already fetched in get(); get_context_data() just picks it up
+        return self.fetched_page
+
+
+class AsyncDetailMixin:
+    """DetailView.get() with the object fetched through ``aget()``."""
+
+    async def aget_object(self):
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404('No %s found matching the query' % queryset.model._meta.verbose_name)
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+
+class AsyncHomeView(views.HomeView):
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        context['featured_projects'] = [project async for project in context['featured_projects']]
+        return self.render_to_response(context)
+
+
+class AsyncProjectsView(AsyncListMixin, views.ProjectsView):
+    pass
+
+
+class AsyncProjectDetailView(AsyncDetailMixin, views.ProjectDetailView):
+    pass
+
+
+class AsyncBlogListView(AsyncListMixin, views.BlogListView):
+    pass
+
+
+class AsyncBlogDetailView(AsyncDetailMixin, views.BlogDetailView):
+    pass
+
+
+class AsyncContactView(views.ContactView):
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
+        if getattr(settings, 'PORTFOLIO_CONTACT_BATCHING', False):
+            await sync_to_async(get_ingestor().submit)(form.cleaned_data)
+        else:
+            await sync_to_async(self.save_contact)(form)
+            if getattr(settings, 'PORTFOLIO_OUTBOX_SEND_ON_SUBMIT', True):
+                # Deliver now without holding up the response; send_outbox retries failures
+                drain_outbox_soon()
+        return self.submitted(form)
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
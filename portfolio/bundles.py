@@ -0,0 +1,279 @@
+"""
+Content-hashed bundles for the CSS and JS that templates used to inline.
+
+``{% bundle %}...{% endbundle %}`` (portfolio_assets library) takes the
+``<style>`` and ``<script>`` elements in its body and minifies them into
+``STATIC_ROOT/bundles/<template>.<hash>.css|js``. The page then gets a
+``<link>`` or ``<script src>`` instead of the inline element. The hash
+changes with the content, so the files are served with
+``Cache-Control: immutable``. ``manage.py build_bundles`` writes every
+bundle ahead of a deploy; rendering never writes, and keeps the (minified)
+elements inline while their bundle hasn't been built.
+"""
+import functools
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core.checks import Error
+from django.core.files.storage import FileSystemStorage
+
+from .compression import compress_file
+
+
+BUNDLE_DIR = 'bundles'
+
+_ELEMENT_RE = re.compile(r'<(style|script)(\s[^>]*)?>(.*?)</\1\s*>', re.DOTALL | re.IGNORECASE)
+_CSS_TOKEN_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.DOTALL)
+
+
+def bundle_root():
+    return Path(settings.STATIC_ROOT) / BUNDLE_DIR
+
+
+def minify_css(css):
+    # Drop comments and keep strings intact, then squeeze whitespace between them
+    strings = []
+
+    def keep(match):
+        if match.group(1) is None:
+            return ' '
+        strings.append(match.group(1))
+        return '\0%d\0' % (len(strings) - 1)
+
+    css = _CSS_TOKEN_RE.sub(keep, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}').strip()
+    return re.sub(r'\0(\d+)\0', lambda m: strings[int(m.group(1))], css)
+
+
+_JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+
+
+def _js_regex_allowed(before):
+    # A '/' starts a regex literal where an operand is expected, not after one
+    before = before.rstrip()
+    if not before or before[-1] in _JS_REGEX_PRECEDERS:
+        return True
+    word = re.search(r'[\w$]+$', before)
+    return word is not None and word.group() in _JS_REGEX_KEYWORDS
+
+
+def _js_skip_quoted(js, i):
+    # From the opening quote at i to just past the closing one
+    quote = js[i]
+    i += 1
+    while i < len(js):
+        char = js[i]
+        if char == '\\':
+            i += 2
+        elif char == quote:
+            return i + 1
+        elif char == '\n' and quote != '`':
+            return i
+        elif quote == '`' and js.startswith('${', i):
+            i = _js_skip_expression(js, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _js_skip_expression(js, i):
+    # From inside a template's ${ to just past its closing }
+    depth = 0
+    while i < len(js):
+        char = js[i]
+        if char in '\'"`':
+            i = _js_skip_quoted(js, i)
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            if not depth:
+                return i + 1
+            depth -= 1
+        i += 1
+    return i
+
+
+def _js_skip_regex(js, i):
+    # From the opening / to just past the flags
+    in_class = False
+    i += 1
+    while i < len(js) and js[i] != '\n':
+        char = js[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < len(js) and (js[i].isalnum() or js[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _js_tokens(js):
+    """
+    Split ``js`` into ``(kind, text)`` pieces, kind being 'code', 'literal'
+    (string, template or regex literal, kept whole) or 'comment'.
+    """
+    pieces = []
+    # Code seen so far, literals standing in as an operand, for _js_regex_allowed
+    before = ''
+    start = i = 0
+    while i < len(js):
+        char = js[i]
+        if char in '\'"`':
+            kind, end = 'literal', _js_skip_quoted(js, i)
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            kind, end = 'comment', len(js) if end == -1 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            kind, end = 'comment', len(js) if end == -1 else end + 2
+        elif char == '/' and _js_regex_allowed(before + js[start:i]):
+            kind, end = 'literal', _js_skip_regex(js, i)
+        else:
+            i += 1
+            continue
+        pieces.append(('code', js[start:i]))
+        pieces.append((kind, js[i:end]))
+        before = (before + js[start:i] + ('0' if kind == 'literal' else ' '))[-64:]
+        start = i = end
+    pieces.append(('code', js[start:]))
+    return pieces
+
+
+def minify_js(js):
+    """
+    Conservative minifier: drops comments, indentation and blank lines, and
+    keeps every newline that ASI might depend on. Comments are found by
+    tokenizing, so string, template and regex literals pass through intact.
+    """
+    literals = []
+    parts = []
+    for kind, text in _js_tokens(js):
+        if kind == 'literal':
+            literals.append(text)
+            parts.append('\0%d\0' % (len(literals) - 1))
+        elif kind == 'comment':
+            parts.append('\n' if '\n' in text else ' ')
+        else:
+            parts.append(text)
+    lines = [line.strip() for line in ''.join(parts).splitlines()]
+    js = '\n'.join(line for line in lines if line)
+    return re.sub(r'\0(\d+)\0', lambda m: literals[int(m.group(1))], js)
+
+
+def split_elements(html):
+    """
+    Return ``(css, js, rest)`` from the inline ``<style>`` and ``<script>``
+    elements in ``html``. ``rest`` is whatever isn't one of them, e.g. a
+    ``<script src>`` that must stay where it is.
+    """
+    css, js, rest = [], [], []
+    position = 0
+    for match in _ELEMENT_RE.finditer(html):
+        rest.append(html[position:match.start()])
+        position = match.end()
+        tag, attrs, body = match.group(1).lower(), match.group(2) or '', match.group(3)
+        if tag == 'style':
+            css.append(body)
+        elif 'src=' in attrs.lower():
+            rest.append(match.group(0))
+        else:
+            js.append(body)
+    rest.append(html[position:])
+    return '\n'.join(css), '\n'.join(js), ''.join(rest).strip()
+
+
+def bundle_name(stem, kind, content):
+    digest = hashlib.sha256(content.encode()).hexdigest()[:12]
+    return f'{BUNDLE_DIR}/{stem}.{digest}.{kind}'
+
+
+def bundle_exists(name):
+    return (Path(settings.STATIC_ROOT) / name).is_file()
+
+
+def write_bundle(name, content):
+    """Write ``content`` to ``name`` below STATIC_ROOT unless it exists."""
+    path = Path(settings.STATIC_ROOT) / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    compress_file(path)
+
+
+@functools.lru_cache(maxsize=256)
+def plan_bundles(stem, html):
+    """
+    Minify the inline elements of ``html`` and name their bundles, without
+    touching the disk. Returns ``(css, js, rest)``; ``css`` and ``js`` are
+    ``(name, content)``, or None when there was nothing of that kind.
+    """
+    css, js, rest = split_elements(html)
+    css = minify_css(css) if css.strip() else None
+    js = minify_js(js) if js.strip() else None
+    return (
+        (bundle_name(stem, 'css', css), css) if css else None,
+        (bundle_name(stem, 'js', js), js) if js else None,
+        rest,
+    )
+
+
+def build_bundles(stem, html):
+    """
+    Write the bundles of the inline elements of ``html``. Returns
+    ``(css_name, js_name, rest)``; either name is None when there was
+    nothing of that kind.
+    """
+    css, js, rest = plan_bundles(stem, html)
+    for bundle in (css, js):
+        if bundle:
+            write_bundle(*bundle)
+    return css and css[0], js and js[0], rest
+
+
+class BundleFinder(BaseFinder):
+    """
+    Let runserver's static handler serve bundles straight from STATIC_ROOT.
+    list() yields nothing, so collectstatic never copies them onto themselves.
+    """
+
+    def check(self, **kwargs):
+        if not getattr(settings, 'STATIC_ROOT', None):
+            return [Error('STATIC_ROOT must be set for template bundles.', id='portfolio.E001')]
+        return []
+
+    def find(self, path, find_all=False, **kwargs):
+        # Like Django's finders, a miss is [] either way
+        if path.startswith(BUNDLE_DIR + '/'):
+            storage = FileSystemStorage(location=settings.STATIC_ROOT)
+            if storage.exists(path):
+                match = storage.path(path)
+                return [match] if find_all else match
+        return []
+
+    def list(self, ignore_patterns):
+        return []
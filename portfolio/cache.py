@@ -0,0 +1,340 @@
+import functools
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.template import engines
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .bundles import bundle_root
+from .compression import precompress_response
+from .models import SiteConfiguration
+from .snapshot import cache_set_if_current, snapshot_outdated
+from .vendor import VENDOR_CSS, VENDOR_JS
+
+
+SITE_CONFIGURATION_KEY = 'portfolio:site_configuration'
+
+# Marker stored when no SiteConfiguration row exists, so "missing" is cached too
+_MISSING = 'portfolio:missing'
+
+# Process-local layer: (expires_at, value)
+_local_config = {}
+
+
+def _shared_cache():
+    alias = getattr(settings, 'PORTFOLIO_CONFIG_CACHE', None)
+    if alias:
+        return caches[alias]
+    return None
+
+
+def _local_site_configuration(now):
+    entry = _local_config.get(SITE_CONFIGURATION_KEY)
+    if entry is not None and entry[0] > now:
+        value = entry[1]
+        return True, None if value == _MISSING else value
+    return False, None
+
+
+def get_site_configuration():
+    """
+    Return the SiteConfiguration singleton (or None) without hitting the
+    database on every request.
+
+    Lookups go through a short-lived in-process layer first, then the
+    optional shared cache named by ``PORTFOLIO_CONFIG_CACHE``, and only then
+    the database. Saves and deletes clear both layers once they commit (see
+    signals.py); other processes pick up the change once their local entry
+    expires.
+    """
+    now = time.monotonic()
+    found, value = _local_site_configuration(now)
+    if found:
+        return value
+
+    shared = _shared_cache()
+    value = shared.get(SITE_CONFIGURATION_KEY) if shared is not None else None
+    if value is None:
+        value = SiteConfiguration.objects.order_by('pk').first() or _MISSING
+        if snapshot_outdated():
+            # Read from a snapshot older than the last save; keep it out of both layers
+            return None if value == _MISSING else value
+        if shared is not None:
+            shared.set(
+                SITE_CONFIGURATION_KEY, value,
+                getattr(settings, 'PORTFOLIO_CONFIG_CACHE_TIMEOUT', 3600),
+            )
+
+    ttl = getattr(settings, 'PORTFOLIO_CONFIG_LOCAL_TTL', 5)
+    _local_config[SITE_CONFIGURATION_KEY] = (now + ttl, value)
+    return None if value == _MISSING else value
+
+
+async def aget_site_configuration():
+    # The in-process layer needs no I/O, so only a miss leaves the event loop
+    found, value = _local_site_configuration(time.monotonic())
+    if found:
+        return value
+    return await sync_to_async(get_site_configuration)()
+
+
+def invalidate_site_configuration():
+    def invalidate():
+        _local_config.pop(SITE_CONFIGURATION_KEY, None)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.delete(SITE_CONFIGURATION_KEY)
+
+    # Clearing before commit would let another request re-cache the old row
+    transaction.on_commit(invalidate)
+
+
+def deploy_digest():
+    """
+    Digest of what every page is rendered from besides the database: the
+    templates, the hashed static URLs (staticfiles manifest), the bundles
+    built so far and whether the vendor assets are self-hosted.
+    """
+    stats = []
+    for engine in engines.all():
+        for directory in engine.template_dirs:
+            for path in sorted(Path(directory).rglob('*')):
+                if path.is_file():
+                    stat = path.stat()
+                    stats.append((str(path), stat.st_mtime_ns, stat.st_size))
+    manifest_name = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest_name and staticfiles_storage.exists(manifest_name):
+        stat = os.stat(staticfiles_storage.path(manifest_name))
+        stats.append((manifest_name, stat.st_mtime_ns, stat.st_size))
+    if bundle_root().is_dir():
+        stats.append(sorted(path.name for path in bundle_root().iterdir()))
+    stats.append([bool(finders.find(name)) for name in (VENDOR_CSS, VENDOR_JS)])
+    return hashlib.sha1(repr(stats).encode(), usedforsecurity=False).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def deploy_version():
+    # Once per process: a deploy (or runserver's reloader) starts new ones
+    return deploy_digest()
+
+
+# Full-page cache
+#
+# Every cached page lists the content groups it was rendered from (e.g.
+# ``projects`` or ``project:42``). Each group has a version number stored in
+# the page cache; the versions are folded into the page key, so bumping a
+# group's version from a model signal orphans exactly the pages built from it.
+# So is deploy_version(), so a deploy orphans all of them.
+
+PAGE_VERSION_KEY = 'portfolio:page-version:%s'
+
+
+def get_page_cache():
+    alias = getattr(settings, 'PORTFOLIO_PAGE_CACHE', None)
+    if alias:
+        return caches[alias]
+    return None
+
+
+def get_page_versions(cache, groups):
+    keys = [PAGE_VERSION_KEY % group for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed from the clock so an evicted version never reuses old keys
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_page_versions(cache, groups):
+    keys = [PAGE_VERSION_KEY % group for group in groups]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_page_groups(*groups):
+    cache = get_page_cache()
+    if cache is None:
+        return
+
+    def bump():
+        for group in groups:
+            key = PAGE_VERSION_KEY % group
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    # Bumping before commit would let another request re-cache the old content
+    transaction.on_commit(bump)
+
+
+def _page_key(request, versions):
+    digest = hashlib.md5(
+        '|'.join([request.get_full_path(), deploy_version()] + [str(v) for v in versions]).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return 'portfolio:page:%s' % digest
+
+
+def page_cache_key(cache, request, groups):
+    return _page_key(request, get_page_versions(cache, groups))
+
+
+async def apage_cache_key(cache, request, groups):
+    return _page_key(request, await aget_page_versions(cache, groups))
+
+
+class PageCacheMixin:
+    """
+    Serve anonymous GET/HEAD responses from the page cache, keyed on path,
+    query string and the versions of the content groups returned by
+    ``get_page_cache_groups()``. Authenticated users always get a fresh page.
+    Works for async views too.
+
+    List it ahead of ConditionalGetMixin: a hit is revalidated against the
+    ETag/Last-Modified it was stored with, so it costs no query.
+    """
+    page_cache_groups = ()
+
+    def get_page_cache_groups(self):
+        return ['site', *self.page_cache_groups]
+
+    def store_page(self, cache, key, request, response):
+        if request.method == 'GET' and response.status_code == 200 and not response.cookies:
+            timeout = getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+            def store(rendered):
+                # Compressed once here rather than on every hit (PrecompressedMiddleware)
+                cache_set_if_current(cache, key, precompress_response(rendered), timeout)
+
+            if hasattr(response, 'render') and callable(response.render):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+        return response
+
+    def cached_response(self, request, response):
+        last_modified = response.get('Last-Modified')
+        not_modified = get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+            response=response,
+        )
+        return response if not_modified is None else not_modified
+
+    def dispatch(self, request, *args, **kwargs):
+        cache = get_page_cache()
+        if cache is None or request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.adispatch_cached(cache, request, *args, **kwargs)
+        if request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(cache, request, self.get_page_cache_groups())
+        response = cache.get(key)
+        if response is not None:
+            return self.cached_response(request, response)
+        return self.store_page(cache, key, request, super().dispatch(request, *args, **kwargs))
+
+    async def adispatch_cached(self, cache, request, *args, **kwargs):
+        if (await request.auser()).is_authenticated:
+            return await super().dispatch(request, *args, **kwargs)
+        key = await apage_cache_key(cache, request, self.get_page_cache_groups())
+        response = await cache.aget(key)
+        if response is not None:
+            return self.cached_response(request, response)
+        # Template responses are rendered (and so stored) by the handler, off the event loop
+        return self.store_page(cache, key, request, await super().dispatch(request, *args, **kwargs))
+
+
+class ConditionalGetMixin:
+    """
+    Send ETag/Last-Modified validators derived from ``updated_at`` and answer
+    revalidations with 304 before any rendering is done.
+
+    Validators come from one aggregate over ``get_conditional_queryset()``
+    plus the cached SiteConfiguration. The row count is folded into the ETag
+    so a deletion, which leaves ``Max('updated_at')`` unchanged, still
+    changes it, and so are the anonymous/authenticated split, since the two
+    get different pages, and deploy_version(), since templates and static
+    URLs change them too.
+    """
+
+    def get_conditional_queryset(self):
+        return self.get_queryset()
+
+    def get_validators(self):
+        stats = self.get_conditional_queryset().order_by().aggregate(
+            last=Max('updated_at'), count=Count('pk'),
+        )
+        return self.build_validators(stats, get_site_configuration(), self.request.user)
+
+    async def aget_validators(self):
+        stats = await self.get_conditional_queryset().order_by().aaggregate(
+            last=Max('updated_at'), count=Count('pk'),
+        )
+        return self.build_validators(stats, await aget_site_configuration(), await self.request.auser())
+
+    def build_validators(self, stats, config, user):
+        if not stats['count']:
+            # Nothing to validate against; let the view decide (e.g. 404)
+            return None, None
+        stamps = [stats['last']]
+        if config is not None and config.updated_at:
+            stamps.append(config.updated_at)
+        last_modified = max(stamps)
+        audience = 'auth' if user.is_authenticated else 'anon'
+        etag = hashlib.md5(
+            '|'.join([self.request.get_full_path(), audience, deploy_version(), str(stats['count'])]
+                     + [stamp.isoformat() for stamp in stamps]).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return quote_etag(etag), int(last_modified.timestamp())
+
+    def add_validators(self, response, etag, last_modified):
+        # A 304 must repeat the validators (RFC 9110 15.4.5)
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.adispatch_conditional(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return super().dispatch(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return self.add_validators(response, etag, last_modified)
+        return self.add_validators(super().dispatch(request, *args, **kwargs), etag, last_modified)
+
+    async def adispatch_conditional(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators()
+        if etag is None:
+            return await super().dispatch(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return self.add_validators(response, etag, last_modified)
+        return self.add_validators(await super().dispatch(request, *args, **kwargs), etag, last_modified)
@@ -0,0 +1,174 @@
+"""
+Admin changelists that stay fast on large tables (FastChangeListMixin).
+
+- Text and JSON columns the list doesn't show are deferred.
+- Counts are exact up to ``PORTFOLIO_ADMIN_EXACT_COUNT_LIMIT`` rows, from a
+  LIMITed query. Past that, the unfiltered list uses the database's row
+  estimate, and filtered lists an exact count cached for
+  ``PORTFOLIO_ADMIN_COUNT_CACHE_TIMEOUT`` seconds. The second, unfiltered
+  count Django runs for "N results (M total)" is skipped.
+- With ``search_index_kind`` set, search goes through the full-text index
+  (search.py) instead of ``icontains`` over every search field.
+- A list_editable save is written with one bulk_update() and one LogEntry
+  insert. post_save is still sent per object, so the cache and search index
+  receivers see the change.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import caches
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .search import matching_ids_sql
+
+
+ADMIN_COUNT_KEY = 'portfolio:admin-count:%s'
+
+
+def estimated_row_count(model):
+    """The database's own estimate of the rows in ``model``'s table, or None without statistics."""
+    connection = connections[router.db_for_read(model)]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s', [table],
+            )
+        elif connection.vendor == 'sqlite':
+            # Written by ANALYZE or PRAGMA optimize; the first number is the row count
+            try:
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            except DatabaseError:
+                return None
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    estimate = int(float(str(row[0]).split()[0]))
+    # PostgreSQL reports -1 for a table that was never analyzed
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        limit = getattr(settings, 'PORTFOLIO_ADMIN_EXACT_COUNT_LIMIT', 10000)
+        counted = queryset.order_by()[:limit + 1].count()
+        if counted <= limit:
+            return counted
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model)
+            if estimate is not None and estimate > limit:
+                return estimate
+        alias = getattr(settings, 'PORTFOLIO_ADMIN_COUNT_CACHE', 'default')
+        if not alias:
+            return queryset.count()
+        key = ADMIN_COUNT_KEY % hashlib.md5(str(queryset.query).encode(), usedforsecurity=False).hexdigest()
+        timeout = getattr(settings, 'PORTFOLIO_ADMIN_COUNT_CACHE_TIMEOUT', 60)
+        return caches[alias].get_or_set(key, queryset.count, timeout)
+
+
+class DeferringChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        deferred = self.model_admin.get_changelist_deferred_fields(request)
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class FastChangeListMixin:
+    # Only the filtered count is run, as "N results (Show all)"
+    show_full_result_count = False
+    # Kind in the full-text index to search instead of search_fields
+    search_index_kind = None
+    # Rows the index leaves out (e.g. drafts), searched with search_fields instead
+    search_unindexed = None
+
+    def get_changelist(self, request, **kwargs):
+        return DeferringChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+
+    def get_changelist_deferred_fields(self, request):
+        shown = {name for name in self.get_list_display(request) if isinstance(name, str)}
+        shown.update(self.list_editable)
+        return [
+            field.name for field in self.opts.concrete_fields
+            if isinstance(field, (models.TextField, models.JSONField)) and field.name not in shown
+        ]
+
+    def get_search_results(self, request, queryset, search_term):
+        query = matching_ids_sql(self.search_index_kind, search_term) if self.search_index_kind else None
+        if query is None:
+            return super().get_search_results(request, queryset, search_term)
+        results = queryset.filter(pk__in=RawSQL(*query))
+        may_have_duplicates = False
+        if self.search_unindexed is not None:
+            unindexed, may_have_duplicates = super().get_search_results(
+                request, queryset.filter(self.search_unindexed), search_term
+            )
+            results |= unindexed
+        return results, may_have_duplicates
+
+    def changelist_view(self, request, extra_context=None):
+        if not (request.method == 'POST' and '_save' in request.POST and self.list_editable):
+            return super().changelist_view(request, extra_context)
+        # save_model() and log_change() collect the edits, written below in bulk
+        request._bulk_edits, request._bulk_log = [], []
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            response = super().changelist_view(request, extra_context)
+            self.save_bulk_edits(request)
+        return response
+
+    def save_model(self, request, obj, form, change):
+        edits = getattr(request, '_bulk_edits', None)
+        if edits is None or not change:
+            return super().save_model(request, obj, form, change)
+        concrete = {field.name for field in self.opts.concrete_fields}
+        edits.append((obj, [name for name in form.changed_data if name in concrete]))
+
+    def log_change(self, request, obj, message):
+        log = getattr(request, '_bulk_log', None)
+        if log is None:
+            return super().log_change(request, obj, message)
+        log.append((obj, message))
+
+    def save_bulk_edits(self, request):
+        edits = [(obj, fields) for obj, fields in request._bulk_edits if fields]
+        if edits:
+            # bulk_update() doesn't run pre_save(), so auto_now fields are set here
+            auto_now = [f.name for f in self.opts.concrete_fields if getattr(f, 'auto_now', False)]
+            now = timezone.now()
+            for obj, fields in edits:
+                for name in auto_now:
+                    setattr(obj, name, now)
+                fields.extend(auto_now)
+            using = router.db_for_write(self.model)
+            self.model.objects.using(using).bulk_update(
+                [obj for obj, _fields in edits], sorted({name for _obj, fields in edits for name in fields}),
+            )
+            for obj, fields in edits:
+                post_save.send(
+                    sender=self.model, instance=obj, created=False,
+                    update_fields=frozenset(fields), raw=False, using=using,
+                )
+
+        by_message = {}
+        for obj, message in request._bulk_log:
+            key = json.dumps(message, sort_keys=True)
+            by_message.setdefault(key, (message, []))[1].append(obj)
+        for message, objects in by_message.values():
+            LogEntry.objects.log_actions(request.user.pk, objects, CHANGE, message)
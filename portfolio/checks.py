@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+
+
+# Caches whose contents other worker processes must see
+SHARED_CACHE_SETTINGS = {
+    'PORTFOLIO_CONFIG_CACHE': None,
+    'PORTFOLIO_PAGE_CACHE': None,
+    'PORTFOLIO_SNAPSHOT_CACHE': 'default',
+}
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs=None, **kwargs):
+    warnings = []
+    for name, default in SHARED_CACHE_SETTINGS.items():
+        alias = getattr(settings, name, default)
+        if alias and alias in settings.CACHES and isinstance(caches[alias], LocMemCache):
+            warnings.append(Warning(
+                f'{name} uses the per-process cache {alias!r}.',
+                hint=(
+                    'Invalidations made in one worker process never reach the others, which keep '
+                    'serving stale content. Use a cache shared between processes (file-based, '
+                    'database, Memcached or Redis).'
+                ),
+                id='portfolio.W001',
+            ))
+    return warnings
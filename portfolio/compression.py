@@ -0,0 +1,114 @@
+"""
+Precompressed responses.
+
+Static files get ``.gz`` siblings, and ``.br`` ones when the optional
+``brotli`` package is installed. These are written when collectstatic runs
+(see storage.py) or when a template bundle is written. Cacheable HTML is
+compressed once, when it is stored in the page cache.
+PrecompressedMiddleware then only picks the variant the client accepts, so
+no response is compressed per request.
+"""
+import gzip
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html', '.ttf', '.otf', '.ico',
+)
+
+# Smaller bodies fit in a packet either way
+MIN_SIZE = 256
+
+
+def available_encodings():
+    """Encodings we can produce, best first."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_file(path):
+    """
+    Write compressed siblings of ``path`` (``style.css.gz``, ``style.css.br``)
+    that are smaller than it and older than none of its changes. Returns the
+    paths written.
+    """
+    path = str(path)
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    stat = os.stat(path)
+    if stat.st_size < MIN_SIZE:
+        return []
+    data = None
+    written = []
+    for encoding in available_encodings():
+        target = path + SUFFIXES[encoding]
+        try:
+            if os.stat(target).st_mtime_ns >= stat.st_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+        body = compress(data, encoding)
+        if len(body) >= len(data):
+            continue
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(body)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+        written.append(target)
+    return written
+
+
+def accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.partition(';')
+        params = params.strip().replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def preferred_encoding(request, offered):
+    accepted = accepted_encodings(request)
+    return next((encoding for encoding in ('br', 'gzip') if encoding in offered and encoding in accepted), None)
+
+
+def precompress_response(response):
+    """
+    Attach compressed copies of an HTML response's body as
+    ``response.precompressed`` (they are pickled along with it into the page
+    cache) for PrecompressedMiddleware to serve.
+    """
+    if (
+        response.streaming
+        or response.has_header('Content-Encoding')
+        or not response.get('Content-Type', '').startswith('text/html')
+        or len(response.content) < MIN_SIZE
+    ):
+        return response
+    response.precompressed = {
+        encoding: compress(response.content, encoding) for encoding in available_encodings()
+    }
+    return response
@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .cache import get_site_configuration
+
+
+def site_configuration(request):
+    # Lazy so pages that never touch {{ config }} skip the lookup entirely
+    return {'config': SimpleLazyObject(get_site_configuration)}
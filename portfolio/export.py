@@ -0,0 +1,198 @@
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from urllib.parse import urlencode
+
+import django
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from .cache import deploy_digest
+from .models import Project, Skill, BlogPost, SiteConfiguration, Technology
+from .pagination import CursorPaginator
+from . import views
+
+
+MANIFEST_NAME = '.export-manifest.json'
+
+
+def _digest(*parts):
+    return hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def _listing_pages(view_class, base, params=None):
+    """
+    Yield ``(url, rows)`` for every page of a listing view with the GET
+    ``params``, paginated the way the view paginates it: ``?cursor=`` pages
+    when cursor pagination is on (see pagination.py), ``?page=`` otherwise.
+    Offset pages shift whenever any row changes, so each one is fingerprinted
+    with the whole listing; a cursor page only with its own rows and whether
+    it links to a next page.
+    """
+    params = dict(params or {})
+    view = view_class()
+    view.setup(RequestFactory().get(base, params))
+    queryset = view.get_queryset().prefetch_related(None)
+    per_page = view.get_paginate_by(queryset)
+
+    def url(extra=None):
+        query = {**params, **(extra or {})}
+        return base + ('?' + urlencode(query) if query else '')
+
+    if view.use_cursor_pagination():
+        fields = ['pk', 'updated_at'] + [name.lstrip('-') for name in view.cursor_ordering]
+        paginator = CursorPaginator(queryset.only(*fields), per_page, view.cursor_ordering)
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            rows = [(obj.pk, obj.updated_at) for obj in page]
+            yield url({'cursor': cursor} if cursor else None), (rows, page.has_next())
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        return
+
+    rows = list(queryset.values_list('pk', 'updated_at'))
+    for number in range(1, max(1, math.ceil(len(rows) / per_page)) + 1):
+        yield url({'page': number} if number > 1 else None), rows
+
+
+def collect_pages():
+    """
+    Return ``{url: fingerprint}`` for every public URL in portfolio.urls that
+    can be served as a flat file. The fingerprint digests the rows the page is
+    rendered from (plus SiteConfiguration and the templates), so a page only
+    needs re-rendering when its fingerprint changes. The contact page is
+    skipped: its form needs a live CSRF token.
+    """
+    common = (
+        _digest(list(SiteConfiguration.objects.order_by('pk').values_list())),
+        deploy_digest(),
+    )
+    projects = list(
+        Project.objects.order_by('pk').values_list('pk', 'category', 'featured', 'updated_at')
+    )
+    skills = _digest(list(Skill.objects.order_by('pk').values_list()))
+    posts = list(
+        BlogPost.objects.filter(published=True).order_by('pk').values_list('pk', 'slug', 'updated_at')
+    )
+
+    pages = {
+        reverse('portfolio:home'): (common, [p for p in projects if p[2]]),
+        reverse('portfolio:about'): (common, skills),
+        reverse('portfolio:skills'): (common, skills),
+    }
+
+    projects_url = reverse('portfolio:projects')
+    listings = [None]
+    listings += [{'category': category} for category, _label in Project.CATEGORY_CHOICES]
+    technologies = Technology.objects.filter(project_links__isnull=False).distinct().order_by('name')
+    listings += [{'tech': name} for name in technologies.values_list('name', flat=True)]
+    for params in listings:
+        pages.update(
+            (url, (common, rows)) for url, rows in _listing_pages(views.ProjectsView, projects_url, params)
+        )
+    for project in projects:
+        pages[reverse('portfolio:project_detail', kwargs={'pk': project[0]})] = (common, project)
+
+    blog_url = reverse('portfolio:blog_list')
+    pages.update((url, (common, rows)) for url, rows in _listing_pages(views.BlogListView, blog_url))
+    for post in posts:
+        pages[reverse('portfolio:blog_detail', kwargs={'slug': post[1]})] = (common, post)
+
+    return {url: _digest(url, inputs) for url, inputs in pages.items()}
+
+
+def load_manifest(root):
+    try:
+        with open(Path(root) / MANIFEST_NAME) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(root, manifest):
+    target = Path(root) / MANIFEST_NAME
+    tmp = target.with_name(target.name + '.tmp')
+    with open(tmp, 'w') as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    os.replace(tmp, target)
+
+
+def remove_page(root, url):
+    """Delete the exported file for ``url`` and any directories left empty."""
+    root = Path(root)
+    target = root / output_path(url)
+    target.unlink(missing_ok=True)
+    for parent in target.parents:
+        if parent == root or not parent.is_relative_to(root):
+            break
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+
+
+def output_path(url):
+    """
+    Map a URL to its file below the export root.
+
+    ``/projects/6/`` becomes ``projects/6/index.html`` and query strings are
+    folded into the file name, so ``/projects/?category=web&page=2`` becomes
+    ``projects/index.category=web&page=2.html``. nginx serves the tree with::
+
+        try_files $uri/index.$args.html $uri/index.html @django;
+    """
+    path, _, query = url.partition('?')
+    name = 'index.%s.html' % query if query else 'index.html'
+    return Path(path.strip('/')) / name
+
+
+def render_url(url):
+    """Render ``url`` through its view as an anonymous GET and return (status, body)."""
+    request = RequestFactory().get(url)
+    request.user = AnonymousUser()
+
+    async def auser():
+        return request.user
+
+    request.auser = auser
+    match = resolve(request.path_info)
+    view = match.func
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    response = view(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    return response.status_code, response.content
+
+
+def init_worker():
+    # Spawned pool workers start without Django configured
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_site.settings')
+    django.setup()
+
+
+def export_url(url, root, previous_hash=None):
+    """
+    Pool task: render ``url`` and write it below ``root``. The file is only
+    rewritten when the rendered bytes differ from ``previous_hash``.
+    Returns ``(url, status, content_hash, written)``.
+    """
+    status, content = render_url(url)
+    if status != 200:
+        return url, status, None, False
+    content_hash = hashlib.sha256(content).hexdigest()
+    target = Path(root) / output_path(url)
+    if content_hash == previous_hash and target.exists():
+        return url, status, content_hash, False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so nginx never serves a half-written page
+    tmp = target.with_name(target.name + '.tmp')
+    tmp.write_bytes(content)
+    os.replace(tmp, target)
+    return url, status, content_hash, True
@@ -0,0 +1,273 @@
+"""
+Static and media file serving for production, under WSGI or ASGI, without a
+separate web server (PORTFOLIO_SERVE_FILES).
+
+Everything collectstatic wrote to STATIC_ROOT is indexed in memory on first
+use, so a hit costs no filesystem calls until the file is opened. Names the
+manifest hashed, and template bundles, are cached forever; other files get
+PORTFOLIO_FILES_MAX_AGE plus ETag/Last-Modified for revalidation. Media files
+are stat'ed per request, since uploads can be replaced.
+
+Responses support conditional GETs and single byte ranges, and pick the
+precompressed ``.br``/``.gz`` sibling of a file when the client accepts it.
+Under WSGI, the file object goes to the server's ``wsgi.file_wrapper``, which
+in gunicorn means sendfile(). Under ASGI, the file is read in chunks off the
+event loop.
+"""
+import mimetypes
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views import View
+
+from .bundles import BUNDLE_DIR
+from .compression import SUFFIXES, preferred_encoding
+from .images import RENDITIONS_DIR
+
+
+CHUNK_SIZE = 64 * 1024
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+@dataclass(frozen=True)
+class ServedFile:
+    path: str
+    size: int
+    mtime: int
+    content_type: str
+    immutable: bool
+    # Encoding -> (path, size) of the precompressed siblings
+    variants: dict = field(default_factory=dict)
+
+    @property
+    def etag(self):
+        return '"%x-%x"' % (self.mtime, self.size)
+
+
+def max_age():
+    return getattr(settings, 'PORTFOLIO_FILES_MAX_AGE', 60 * 60)
+
+
+def served_file(path, immutable):
+    """Describe the file at ``path``, or return None if there isn't one."""
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if not os.path.isfile(path):
+        return None
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding or not content_type:
+        content_type = 'application/octet-stream'
+    elif content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+        content_type += '; charset=utf-8'
+    variants = {}
+    for name, suffix in SUFFIXES.items():
+        try:
+            variants[name] = (path + suffix, os.stat(path + suffix).st_size)
+        except FileNotFoundError:
+            pass
+    return ServedFile(path, stat.st_size, stat.st_mtime_ns, content_type, immutable, variants)
+
+
+class StaticFileIndex:
+    """STATIC_ROOT, stat'ed once: name -> ServedFile."""
+
+    def __init__(self, root):
+        self.root = str(root)
+        hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        self.files = {}
+        for directory, _dirs, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(tuple(SUFFIXES.values())):
+                    continue
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+                entry = served_file(path, relative in hashed or self.is_bundle(relative))
+                if entry is not None:
+                    self.files[relative] = entry
+
+    def is_bundle(self, name):
+        return name.startswith(BUNDLE_DIR + '/')
+
+    def get(self, name):
+        entry = self.files.get(name)
+        if entry is None:
+            # Written since the index was built (template bundles) or not collected
+            try:
+                entry = served_file(safe_join(self.root, name), self.is_bundle(name))
+            except SuspiciousFileOperation:
+                return None
+            if entry is not None:
+                self.files[name] = entry
+        return entry
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_static_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = StaticFileIndex(settings.STATIC_ROOT)
+    return _index
+
+
+class RangeFile:
+    """``length`` bytes of ``fh`` from ``start``; keeps fileno() so servers can still sendfile()."""
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self.fh = fh
+        self.name = fh.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fh.fileno()
+
+    def close(self):
+        self.fh.close()
+
+
+async def _read_chunks(fh):
+    read = sync_to_async(fh.read, thread_sensitive=False)
+    try:
+        while chunk := await read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        fh.close()
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` of a single ``bytes=`` range, None to ignore the header
+    (multiple or malformed ranges get the whole file), or False when it
+    can't be satisfied.
+    """
+    match = _RANGE_RE.match(header.replace(' ', ''))
+    if match is None or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def serve(request, entry):
+    """Response for ``entry``, honouring conditional, Range and Accept-Encoding headers."""
+    last_modified = entry.mtime // 1_000_000_000
+    response = get_conditional_response(request, etag=entry.etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, entry)
+    # A compressed body is a different byte sequence, so its ETag is only weakly equal
+    response.headers['ETag'] = ('W/' if response.has_header('Content-Encoding') else '') + entry.etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = IMMUTABLE if entry.immutable else 'public, max-age=%d' % max_age()
+    if entry.variants:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _file_response(request, entry):
+    path, size, encoding = entry.path, entry.size, None
+    byte_range = None
+    if 'Range' in request.headers:
+        # If-Range: only send part of the file if it is the version the client has
+        if_range = request.headers.get('If-Range')
+        if if_range is None or if_range in (entry.etag, http_date(entry.mtime // 1_000_000_000)):
+            byte_range = parse_range(request.headers['Range'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = 'bytes */%d' % size
+            return response
+    if byte_range is None:
+        # Ranges refer to the identity body, so only whole files are sent compressed
+        encoding = preferred_encoding(request, entry.variants)
+        if encoding is not None:
+            path, size = entry.variants[encoding]
+
+    fh = open(path, 'rb')
+    start, length = 0, size
+    if byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+    if isinstance(request, ASGIRequest):
+        content = _read_chunks(RangeFile(fh, start, length))
+    elif byte_range is not None:
+        content = RangeFile(fh, start, length)
+    else:
+        content = fh
+    response = FileResponse(content, content_type=entry.content_type)
+    response.block_size = CHUNK_SIZE
+    # Like a front-end server: no attachment name, which would also name the .br/.gz sibling
+    response.headers.pop('Content-Disposition', None)
+    response.headers['Content-Length'] = str(length)
+    response.headers['Accept-Ranges'] = 'bytes'
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    if byte_range is not None:
+        response.status_code = 206
+        response.headers['Content-Range'] = 'bytes %d-%d/%d' % (start, start + length - 1, entry.size)
+    return response
+
+
+class StaticFileView(View):
+    """Serve STATIC_ROOT, falling back to the staticfiles finders for anything not collected."""
+
+    def get(self, request, path):
+        entry = get_static_index().get(path)
+        if entry is None:
+            try:
+                found = finders.find(path)
+            except SuspiciousFileOperation:
+                found = None
+            entry = served_file(found, False) if found else None
+        if entry is None:
+            raise Http404('No such file')
+        return serve(request, entry)
+
+
+class MediaFileView(View):
+    """Serve MEDIA_ROOT. Renditions have content-derived names, so they are cached forever."""
+
+    def get(self, request, path):
+        try:
+            filename = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise Http404('No such file')
+        entry = served_file(filename, path.startswith(RENDITIONS_DIR + '/'))
+        if entry is None:
+            raise Http404('No such file')
+        return serve(request, entry)
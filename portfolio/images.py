@@ -0,0 +1,171 @@
+"""
+Responsive image renditions for Project.image and BlogPost.image.
+
+Each upload is re-encoded at a ladder of widths (never wider than the
+original) in every format in PORTFOLIO_IMAGE_FORMATS that this Pillow build
+can write. The result is recorded on the row's ``image_renditions`` field:
+
+    {"source": "projects/shot.png", "width": 2400, "height": 1600,
+     "formats": {"avif": [[320, 213, "renditions/..."], ...], "webp": [...], "jpeg": [...]}}
+
+The ``{% responsive_image %}`` tag renders ``<picture>`` srcsets from it.
+Renditions are built off the request path by a small thread pool after the
+upload commits; ``manage.py build_image_renditions`` backfills old media.
+Rendition names include a digest of the source bytes, so they never change
+content and can be cached forever.
+"""
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = 'renditions'
+
+# Encoder settings per format: (Pillow format, file extension, save options)
+FORMATS = {
+    'avif': ('AVIF', 'avif', {'quality': 55, 'speed': 6}),
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def rendition_widths():
+    return sorted(getattr(settings, 'PORTFOLIO_IMAGE_WIDTHS', [320, 640, 960, 1280, 1920]))
+
+
+def rendition_formats():
+    """Configured formats this Pillow build can encode, best compression first."""
+    configured = getattr(settings, 'PORTFOLIO_IMAGE_FORMATS', ['avif', 'webp', 'jpeg'])
+    return [name for name in configured if name == 'jpeg' or features.check(name)]
+
+
+def _target_widths(width):
+    widths = [w for w in rendition_widths() if w < width]
+    # Always offer the original width, capped at the top of the ladder
+    top = min(width, rendition_widths()[-1])
+    if top not in widths:
+        widths.append(top)
+    return widths
+
+
+def _encode(image, fmt):
+    pil_format, _ext, options = FORMATS[fmt]
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        background = Image.new('RGB', image.size, (0, 0, 0))
+        background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate_renditions(field_file, overwrite=False):
+    """
+    Encode every rendition of ``field_file`` and return the renditions record.
+    Files already written for the same source bytes are reused unless
+    ``overwrite`` is set (e.g. after changing the encoder settings).
+    """
+    with field_file.open('rb') as fh:
+        data = fh.read()
+    digest = hashlib.sha1(data, usedforsecurity=False).hexdigest()[:12]
+    source = Image.open(io.BytesIO(data))
+    source = ImageOps.exif_transpose(source)
+    source = source.convert('RGBA' if 'A' in source.getbands() or 'transparency' in source.info else 'RGB')
+    width, height = source.size
+
+    stem = PurePosixPath(field_file.name)
+    directory = PurePosixPath(RENDITIONS_DIR) / stem.parent / f'{stem.stem}-{digest}'
+    formats = {}
+    for fmt in rendition_formats():
+        formats[fmt] = []
+        for target in _target_widths(width):
+            target_height = max(1, round(height * target / width))
+            resized = source if target == width else source.resize(
+                (target, target_height), Image.Resampling.LANCZOS, reducing_gap=3.0,
+            )
+            name = str(directory / f'{target}.{FORMATS[fmt][1]}')
+            if overwrite and default_storage.exists(name):
+                default_storage.delete(name)
+            if not default_storage.exists(name):
+                saved = default_storage.save(name, ContentFile(_encode(resized, fmt)))
+                if saved != name:
+                    # Another worker wrote it first; ours is an identical copy
+                    default_storage.delete(saved)
+            formats[fmt].append([target, target_height, name])
+    return {'source': field_file.name, 'width': width, 'height': height, 'formats': formats}
+
+
+def rendition_names(renditions):
+    return {name for entries in (renditions or {}).get('formats', {}).values() for _w, _h, name in entries}
+
+
+def needs_renditions(obj):
+    renditions = obj.image_renditions or {}
+    return (obj.image.name or '') != renditions.get('source', '')
+
+
+def build_renditions(model, pk, force=False):
+    """
+    Bring the renditions of one row in line with its current image and delete
+    the files of any it replaces. Returns True if the row was updated.
+    """
+    obj = model._default_manager.filter(pk=pk).first()
+    if obj is None or not (force or needs_renditions(obj)):
+        return False
+    previous = obj.image_renditions or {}
+    renditions = generate_renditions(obj.image, overwrite=force) if obj.image else {}
+    if renditions == previous:
+        return False
+    obj.image_renditions = renditions
+    # A regular save, so page caches, ETags and snapshots pick up the new markup
+    obj.save(update_fields=['image_renditions', 'updated_at'])
+    for name in rendition_names(previous) - rendition_names(renditions):
+        default_storage.delete(name)
+    return True
+
+
+def _run_job(model, pk):
+    try:
+        build_renditions(model, pk)
+    except Exception:
+        logger.exception('Failed to build image renditions for %s %s', model.__name__, pk)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PORTFOLIO_IMAGE_WORKERS', 2),
+                    thread_name_prefix='image-renditions',
+                )
+    return _executor
+
+
+def schedule_renditions(obj):
+    """Queue a rendition build for ``obj`` once the current transaction commits."""
+    model, pk = type(obj), obj.pk
+    if getattr(settings, 'PORTFOLIO_IMAGE_BACKGROUND', True):
+        transaction.on_commit(lambda: get_executor().submit(_run_job, model, pk))
+    else:
+        transaction.on_commit(lambda: build_renditions(model, pk))
@@ -0,0 +1,289 @@
+"""
+Batched contact ingestion for SQLite.
+
+Every POST to ContactView otherwise takes SQLite's single writer lock for
+its own transaction. With ``PORTFOLIO_CONTACT_BATCHING`` on, validated
+submissions are appended to a journal segment on disk and queued in memory.
+A background thread then writes them with one ``bulk_create`` transaction
+every ``PORTFOLIO_CONTACT_BATCH_INTERVAL_MS`` or
+``PORTFOLIO_CONTACT_BATCH_MAX_ROWS`` rows, whichever comes first.
+
+A segment is deleted only after its rows have committed. Segments left by a
+process that died are replayed, either by the next ingestor to start or by
+``manage.py replay_contact_journal``. Each submission carries a UUID that is
+stored as ``Contact.ingest_id``, so a replay never inserts a row twice.
+
+Segment names carry a random token per ingestor, never a PID, since PIDs are
+reused (a restarted container's worker often gets its predecessor's). An
+ingestor holds an exclusive ``flock`` on every segment it may still write
+or flush; the kernel drops it when the process dies, and replay skips the
+segments that are still locked.
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows, where an open segment can't be unlinked instead
+    fcntl = None
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import get_site_configuration
+from .models import Contact, OutboxMessage
+from .outbox import build_contact_notification
+
+
+logger = logging.getLogger(__name__)
+
+CONTACT_FIELDS = ['name', 'email', 'subject', 'message']
+
+
+def journal_dir():
+    return Path(getattr(settings, 'PORTFOLIO_CONTACT_JOURNAL_DIR'))
+
+
+def write_contacts(payloads):
+    """
+    Insert journal payloads as Contacts (plus their outbox notifications) in a
+    single transaction, skipping any already stored. Returns the number inserted.
+    """
+    # A retried batch can be journaled twice; keep the first copy of each id
+    unique = {}
+    for payload in payloads:
+        unique.setdefault(payload['id'], payload)
+    payloads = list(unique.values())
+    ids = [payload['id'] for payload in payloads]
+    with transaction.atomic():
+        existing = {
+            str(pk) for pk in Contact.objects.filter(ingest_id__in=ids).values_list('ingest_id', flat=True)
+        }
+        contacts = [
+            Contact(
+                ingest_id=payload['id'],
+                created_at=parse_datetime(payload['created_at']),
+                **{field: payload[field] for field in CONTACT_FIELDS},
+            )
+            for payload in payloads if payload['id'] not in existing
+        ]
+        Contact.objects.bulk_create(contacts)
+        config = get_site_configuration()
+        if config and config.email and contacts:
+            OutboxMessage.objects.bulk_create(
+                [build_contact_notification(contact, config.email) for contact in contacts]
+            )
+    return len(contacts)
+
+
+def _read_segment(path):
+    payloads = []
+    with open(path) as fh:
+        for line in fh:
+            try:
+                payloads.append(json.loads(line))
+            except ValueError:
+                # A torn final line from a crash mid-write; it was never acknowledged
+                break
+    return payloads
+
+
+def _lock_segment(fh):
+    """Take ``fh``'s segment for this process; False if another ingestor holds it."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def replay_journal(include_live=False, owner=None):
+    """
+    Write out the segments no live ingestor holds (or all of them with
+    ``include_live``) and delete them. The segments of ingestor ``owner``
+    (its token) are always left alone. Returns ``(segments, inserted)``.
+    """
+    directory = journal_dir()
+    if not directory.exists():
+        return 0, 0
+    segments = inserted = 0
+    for path in sorted(directory.glob('*.ndjson')):
+        if owner is not None and path.name.startswith(owner + '-'):
+            continue
+        try:
+            fh = open(path)
+        except FileNotFoundError:
+            # Flushed by its ingestor since the listing
+            continue
+        with fh:
+            if not include_live and not _lock_segment(fh):
+                continue
+            payloads = _read_segment(path)
+            if payloads:
+                inserted += write_contacts(payloads)
+            try:
+                path.unlink(missing_ok=True)
+            except PermissionError:
+                # Still open in a live process (Windows); its rows were written above
+                continue
+        segments += 1
+    return segments, inserted
+
+
+class ContactIngestor:
+    def __init__(self):
+        self.max_rows = getattr(settings, 'PORTFOLIO_CONTACT_BATCH_MAX_ROWS', 100)
+        self.interval = getattr(settings, 'PORTFOLIO_CONTACT_BATCH_INTERVAL_MS', 200) / 1000
+        self.fsync = getattr(settings, 'PORTFOLIO_CONTACT_JOURNAL_FSYNC', True)
+        self.directory = journal_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = []
+        # Journal writes are numbered; _synced is the last one known on disk
+        self._written = self._synced = 0
+        self._syncing = False
+        self._synced_changed = threading.Condition()
+        self.token = uuid.uuid4().hex
+        self._sequence = itertools.count()
+        self._segment_path = self._segment = None
+        self._open_segment()
+
+        self._thread = threading.Thread(target=self._run, name='contact-ingestor', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _open_segment(self):
+        self._segment_path = self.directory / f'{self.token}-{next(self._sequence):08d}.ndjson'
+        # 'x': a name that exists already is another ingestor's, never to be appended to
+        self._segment = open(self._segment_path, 'x')
+        _lock_segment(self._segment)
+
+    def _journal(self, payloads):
+        # Called with self._lock held. Returns the write's number for _sync()
+        for payload in payloads:
+            self._segment.write(json.dumps(payload) + '\n')
+        self._segment.flush()
+        self._written += 1
+        return self._written
+
+    def _seal_segment(self):
+        # Called with self._lock held; whatever was written to it is on disk
+        # after. It stays open, and so locked, until its rows have committed
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+            with self._synced_changed:
+                self._synced = max(self._synced, self._written)
+                self._synced_changed.notify_all()
+        return self._segment
+
+    def _sync(self, written):
+        """
+        Return once journal write ``written`` is on disk. Group commit: the
+        first waiter fsyncs the segment for every write made so far, and the
+        submissions that arrive meanwhile wait for that one flush or the next,
+        instead of each taking a disk flush under the ingestor lock.
+        """
+        if not self.fsync:
+            return
+        with self._synced_changed:
+            while self._synced < written:
+                if not self._syncing:
+                    self._syncing = True
+                    break
+                self._synced_changed.wait()
+            else:
+                return
+        synced = None
+        try:
+            with self._lock:
+                target = self._written
+                # A duplicate survives the segment being rotated under us
+                fd = os.dup(self._segment.fileno())
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            synced = target
+        finally:
+            with self._synced_changed:
+                self._syncing = False
+                if synced is not None:
+                    self._synced = max(self._synced, synced)
+                self._synced_changed.notify_all()
+
+    def submit(self, cleaned_data):
+        """Journal and queue one validated ContactForm payload."""
+        payload = {field: cleaned_data[field] for field in CONTACT_FIELDS}
+        payload['id'] = str(uuid.uuid4())
+        payload['created_at'] = timezone.now().isoformat()
+        with self._lock:
+            written = self._journal([payload])
+            self._pending.append(payload)
+            if len(self._pending) >= self.max_rows:
+                self._wakeup.notify()
+        # The lock is released first, so other submissions join this flush
+        self._sync(written)
+        return payload['id']
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            # New submissions go to a fresh segment while this batch is written
+            flushed = self._seal_segment()
+            flushed_segment = self._segment_path
+            self._open_segment()
+        try:
+            inserted = write_contacts(batch)
+        except Exception:
+            logger.exception('Failed to write %s contacts; will retry', len(batch))
+            with self._lock:
+                # Move the batch into the live segment before dropping the old one
+                written = self._journal(batch)
+                self._pending[:0] = batch
+            self._sync(written)
+            inserted = 0
+        finally:
+            close_old_connections()
+        if fcntl is None:
+            flushed.close()
+        # Otherwise unlinked while still locked, so no replay finds it unheld
+        flushed_segment.unlink(missing_ok=True)
+        flushed.close()
+        return inserted
+
+    def _run(self):
+        try:
+            replay_journal(owner=self.token)
+        except Exception:
+            logger.exception('Failed to replay the contact journal')
+        while True:
+            with self._lock:
+                self._wakeup.wait_for(lambda: len(self._pending) >= self.max_rows, self.interval)
+            self.flush()
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor():
+    global _ingestor
+    if _ingestor is None:
+        with _ingestor_lock:
+            if _ingestor is None:
+                _ingestor = ContactIngestor()
+    return _ingestor
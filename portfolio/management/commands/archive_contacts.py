@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.archive import archive_contacts, archive_days, archive_dir, vacuum
+from portfolio.transfer import CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Move read contact messages older than N days into monthly gzipped NDJSON archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=archive_days(),
+            help='Archive read messages older than this (default: PORTFOLIO_CONTACT_ARCHIVE_DAYS)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f'Rows fetched and deleted per query (default: {CHUNK_SIZE})',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived')
+        parser.add_argument(
+            '--vacuum', action='store_true',
+            help='VACUUM afterwards so SQLite gives the freed space back (locks the database while it runs)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = archive_contacts(options['days'], options['chunk_size'], options['dry_run'])
+        for month, count in sorted(counts.items()):
+            self.stdout.write(f'{month}: {count}')
+        total = sum(counts.values())
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run: {total} messages would be archived'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total} messages to {archive_dir()} in {time.perf_counter() - started:.2f}s'
+        ))
+        if options['vacuum'] and total:
+            started = time.perf_counter()
+            if vacuum():
+                self.stdout.write(f'Vacuumed in {time.perf_counter() - started:.2f}s')
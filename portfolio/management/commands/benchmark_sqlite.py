@@ -0,0 +1,117 @@
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.sqlite import apply_pragmas, get_pragmas
+
+
+READ_QUERIES = [
+    'SELECT id, title, short_description FROM portfolio_project ORDER BY featured DESC, created_at DESC LIMIT 9',
+    'SELECT id, title, excerpt FROM portfolio_blogpost WHERE published ORDER BY created_at DESC LIMIT 6',
+    'SELECT name, category, proficiency FROM portfolio_skill ORDER BY category, proficiency DESC',
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure page-style reads while an admin-style writer is active, with default vs tuned SQLite pragmas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per scenario (default: 5)')
+        parser.add_argument('--readers', type=int, default=8, help='Concurrent reader threads (default: 8)')
+        parser.add_argument(
+            '--write-hold', type=float, default=0.02,
+            help='Seconds each write transaction stays open, like a slow admin save (default: 0.02)',
+        )
+
+    def handle(self, *args, **options):
+        source = settings.DATABASES['default']['NAME']
+        self.stdout.write(f'Copying {source} for an isolated run...')
+        scenarios = [
+            ('default', {'journal_mode': 'delete', 'synchronous': 'full', 'busy_timeout': 5000}),
+            ('tuned', get_pragmas()),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, pragmas in scenarios:
+                path = Path(tmp) / f'{name}.sqlite3'
+                with sqlite3.connect(source) as src, sqlite3.connect(path) as dst:
+                    src.backup(dst)
+                stats = self.run_scenario(path, pragmas, options)
+                self.report(name, stats)
+
+    def connect(self, path, pragmas):
+        connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        apply_pragmas(connection, pragmas)
+        return connection
+
+    def run_scenario(self, path, pragmas, options):
+        stop = threading.Event()
+        latencies, errors, writes = [], [], [0]
+        lock = threading.Lock()
+
+        def reader(index):
+            connection = self.connect(path, pragmas)
+            local = []
+            i = index
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    connection.execute(READ_QUERIES[i % len(READ_QUERIES)]).fetchall()
+                except sqlite3.OperationalError as exc:
+                    with lock:
+                        errors.append(str(exc))
+                    continue
+                local.append(time.perf_counter() - started)
+                i += 1
+            connection.close()
+            with lock:
+                latencies.extend(local)
+
+        def writer():
+            connection = self.connect(path, pragmas)
+            while not stop.is_set():
+                try:
+                    connection.execute('BEGIN IMMEDIATE')
+                    connection.execute(
+                        "UPDATE portfolio_blogpost SET content = content || ' ', updated_at = datetime('now')"
+                    )
+                    time.sleep(options['write_hold'])
+                    connection.execute('COMMIT')
+                    writes[0] += 1
+                except sqlite3.OperationalError as exc:
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+                    with lock:
+                        errors.append(str(exc))
+            connection.close()
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(options['readers'])]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            'reads': len(latencies),
+            'reads_per_second': len(latencies) / options['duration'],
+            'writes': writes[0],
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+            'p99_ms': statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) > 1 else 0,
+            'max_ms': max(latencies) * 1000 if latencies else 0,
+            'errors': len(errors),
+        }
+
+    def report(self, name, stats):
+        self.stdout.write(
+            f"{name:>8}: {stats['reads_per_second']:9.0f} reads/s  "
+            f"p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  "
+            f"max {stats['max_ms']:8.2f} ms  writes {stats['writes']:5d}  errors {stats['errors']}"
+        )
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import Context, engines
+
+from portfolio.bundles import bundle_root, build_bundles
+from portfolio.compression import SUFFIXES
+from portfolio.templatetags.portfolio_assets import BundleNode
+
+
+class Command(BaseCommand):
+    help = 'Write the content-hashed CSS/JS bundles of every template into STATIC_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clean', action='store_true', help='Delete bundles no template refers to any more')
+
+    def template_names(self, engine):
+        for directory in engine.template_dirs:
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*.html')):
+                yield path.relative_to(directory).as_posix()
+
+    def handle(self, *args, **options):
+        engine = engines['django']
+        written = set()
+        inline_bytes = bundled_bytes = 0
+        for name in self.template_names(engine):
+            template = engine.get_template(name).template
+            nodes = template.nodelist.get_nodes_by_type(BundleNode)
+            if not nodes:
+                continue
+            # Bundle bodies don't depend on the request, so an empty context renders them
+            context = Context()
+            with context.bind_template(template):
+                for node in nodes:
+                    body = node.nodelist.render(context)
+                    css, js, _rest = build_bundles(node.stem, body)
+                    inline_bytes += len(body.encode())
+                    for bundle in filter(None, (css, js)):
+                        written.add(bundle)
+                        bundled_bytes += (Path(settings.STATIC_ROOT) / bundle).stat().st_size
+            self.stdout.write(f'{name}: {len(nodes)} bundle(s)')
+
+        removed = 0
+        if options['clean'] and bundle_root().is_dir():
+            for path in bundle_root().iterdir():
+                name = f'{path.parent.name}/{path.name}'
+                # Keep the .gz/.br siblings of the bundles still in use
+                for suffix in SUFFIXES.values():
+                    name = name.removesuffix(suffix)
+                if name not in written:
+                    path.unlink()
+                    removed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(written)} bundles, {inline_bytes} bytes inline -> {bundled_bytes} bytes minified'
+            + (f', {removed} stale removed' if removed else '')
+        ))
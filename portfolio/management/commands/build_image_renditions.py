@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from portfolio.images import build_renditions, needs_renditions, rendition_formats
+from portfolio.models import Project, BlogPost
+
+
+class Command(BaseCommand):
+    help = 'Build missing or outdated responsive renditions of project and blog post images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Rebuild every image, not just outdated ones')
+        parser.add_argument(
+            '--workers', type=int, default=getattr(settings, 'PORTFOLIO_IMAGE_WORKERS', 2),
+            help='Images encoded in parallel (default: PORTFOLIO_IMAGE_WORKERS)',
+        )
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model in (Project, BlogPost):
+            for obj in model.objects.only('pk', 'image', 'image_renditions'):
+                if options['force'] or needs_renditions(obj):
+                    jobs.append((model, obj.pk))
+        self.stdout.write(f"{len(jobs)} images to process ({', '.join(rendition_formats())})")
+
+        def run(model, pk):
+            try:
+                return build_renditions(model, pk, force=options['force'])
+            finally:
+                close_old_connections()
+
+        built = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(run, model, pk): (model, pk) for model, pk in jobs}
+            for future in as_completed(futures):
+                model, pk = futures[future]
+                try:
+                    if future.result():
+                        built += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'{model.__name__} {pk}: {type(exc).__name__}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Updated renditions for {built} images ({failed} failed)'))
@@ -0,0 +1,54 @@
+import gzip
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.transfer import CHUNK_SIZE, CONTENT_MODELS, copy_media_out, dumps, export_records, header
+
+
+class Command(BaseCommand):
+    help = 'Stream projects, skills, blog posts and contact messages to an NDJSON file (.gz is compressed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default='-', help='File to write, or - for stdout (default)')
+        parser.add_argument(
+            '--model', action='append', dest='models', choices=list(CONTENT_MODELS),
+            help='Export only this model (repeatable; default: all)',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f'Rows fetched per query (default: {CHUNK_SIZE})',
+        )
+        parser.add_argument('--media', help='Also copy the image files the rows reference into this directory')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        output = options['output']
+        if output == '-':
+            out = sys.stdout
+        elif output.endswith('.gz'):
+            out = gzip.open(output, 'wt', encoding='utf-8')
+        else:
+            out = open(output, 'w', encoding='utf-8')
+        names = [name for name in CONTENT_MODELS if name in (options['models'] or CONTENT_MODELS)]
+        counts = dict.fromkeys(names, 0)
+        missing = []
+        try:
+            out.write(dumps(header()) + '\n')
+            for record in export_records(names, options['chunk_size']):
+                out.write(dumps(record) + '\n')
+                counts[record['model']] += 1
+                if options['media']:
+                    missing += copy_media_out(record, options['media'])
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        # Progress goes to stderr, stdout may be the export itself
+        for name in missing:
+            self.stderr.write(self.style.WARNING(f'Missing from media storage: {name}'))
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {", ".join(f"{count} {name}" for name, count in counts.items())} '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
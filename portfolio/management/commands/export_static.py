@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from portfolio.export import (
+    collect_pages, export_url, init_worker, load_manifest, save_manifest,
+    remove_page, output_path,
+)
+
+
+class Command(BaseCommand):
+    help = 'Pre-render every public portfolio page to a static directory tree'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', default=getattr(settings, 'PORTFOLIO_EXPORT_ROOT', None),
+            help='Directory to write the rendered site to (default: PORTFOLIO_EXPORT_ROOT)',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of rendering processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Re-render every page, ignoring the previous export manifest',
+        )
+
+    def handle(self, *args, **options):
+        root = options['output']
+        if not root:
+            self.stderr.write(self.style.ERROR('No output directory: pass --output or set PORTFOLIO_EXPORT_ROOT'))
+            return
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        previous = {} if options['full'] else load_manifest(root).get('pages', {})
+        pages = collect_pages()
+
+        # Only pages whose inputs changed (or whose file went missing) are rendered
+        stale = [
+            url for url, fingerprint in pages.items()
+            if previous.get(url, {}).get('inputs') != fingerprint
+            or not (root / output_path(url)).exists()
+        ]
+        self.stdout.write(f'{len(stale)} of {len(pages)} pages need rendering...')
+
+        manifest = {url: entry for url, entry in previous.items() if url in pages}
+        written = skipped = 0
+        if stale:
+            # Workers open their own connections; never share one across a fork
+            connections.close_all()
+            hashes = [previous.get(url, {}).get('hash') for url in stale]
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=init_worker) as pool:
+                results = pool.map(export_url, stale, [str(root)] * len(stale), hashes)
+                for url, status, content_hash, was_written in results:
+                    if content_hash is None:
+                        skipped += 1
+                        manifest.pop(url, None)
+                        remove_page(root, url)
+                        self.stdout.write(self.style.WARNING(f'Skipped {url} (HTTP {status})'))
+                        continue
+                    manifest[url] = {'inputs': pages[url], 'hash': content_hash}
+                    if was_written:
+                        written += 1
+                        if options['verbosity'] > 1:
+                            self.stdout.write(f'Wrote {url}')
+
+        # Pages whose rows were deleted or unpublished disappear from the tree
+        removed = [url for url in previous if url not in pages]
+        for url in removed:
+            remove_page(root, url)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Removed {url}')
+
+        save_manifest(root, {'pages': manifest})
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {len(stale) - skipped}, rewrote {written}, removed {len(removed)} '
+            f'pages in {time.perf_counter() - started:.2f}s'
+        ))
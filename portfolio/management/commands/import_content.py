@@ -0,0 +1,75 @@
+import gzip
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio.transfer import CHUNK_SIZE, CONTENT_MODELS, FORMAT, VERSION, ContentError, Importer
+
+
+class Command(BaseCommand):
+    help = 'Load an export_content NDJSON file (.gz is decompressed) in chunked bulk inserts, in one transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', nargs='?', default='-', help='File to read, or - for stdin (default)')
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help=f'Rows written per bulk query (default: {CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--update', action='store_true',
+            help='Overwrite rows whose primary key already exists (default: skip them)',
+        )
+        parser.add_argument('--media', help='Directory export_content --media copied the image files to')
+
+    def open(self, name):
+        if name == '-':
+            return sys.stdin
+        if name.endswith('.gz'):
+            return gzip.open(name, 'rt', encoding='utf-8')
+        return open(name, encoding='utf-8')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        importer = Importer(options['chunk_size'], options['update'], options['media'])
+        source = self.open(options['input'])
+        try:
+            with transaction.atomic():
+                for number, line in enumerate(source, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError as exc:
+                        raise CommandError(f'Line {number}: {exc}')
+                    if number == 1:
+                        if not isinstance(record, dict) or record.get('format') != FORMAT:
+                            raise CommandError(f'Not a {FORMAT} file')
+                        if record.get('version') != VERSION:
+                            raise CommandError(f'Unsupported {FORMAT} version {record.get("version")!r}')
+                        continue
+                    try:
+                        importer.add(record)
+                    except ContentError as exc:
+                        raise CommandError(f'Line {number}: {exc}')
+                try:
+                    importer.finish()
+                except ContentError as exc:
+                    raise CommandError(exc)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+        for name in importer.missing_files:
+            self.stdout.write(self.style.WARNING(f'Image not found in storage or --media: {name}'))
+        for name in CONTENT_MODELS:
+            if importer.created[name] or importer.updated[name] or importer.skipped[name]:
+                self.stdout.write(
+                    f'{name}: {importer.created[name]} created, {importer.updated[name]} updated, '
+                    f'{importer.skipped[name]} skipped'
+                )
+        self.stdout.write(self.style.SUCCESS(f'Imported in {time.perf_counter() - started:.2f}s'))
+        if importer.created['project'] or importer.created['blogpost'] or options['update']:
+            self.stdout.write('Run build_image_renditions to build the responsive images')
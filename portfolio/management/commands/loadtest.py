@@ -0,0 +1,138 @@
+import asyncio
+import itertools
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+DEFAULT_PATHS = ['/', '/projects/', '/blog/', '/contact/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test running servers with many concurrent keep-alive clients and compare them, '
+        'e.g. --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True, metavar='NAME=URL',
+            help='Server to test; repeat to compare several',
+        )
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Path to request; repeat for a mix (default: %s)' % ', '.join(DEFAULT_PATHS),
+        )
+        parser.add_argument('--concurrency', type=int, default=256, help='Concurrent connections (default: 256)')
+        parser.add_argument('--duration', type=float, default=15.0, help='Seconds per target (default: 15)')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds first (default: 2)')
+        parser.add_argument(
+            '--bust-cache', action='store_true',
+            help='Add a unique query string to every request so the page cache never answers',
+        )
+
+    def handle(self, *args, **options):
+        targets = []
+        for spec in options['target']:
+            name, sep, url = spec.partition('=')
+            parts = urlsplit(url)
+            if not sep or parts.scheme != 'http' or not parts.hostname:
+                raise CommandError(f'Expected NAME=http://host:port, got {spec!r}')
+            targets.append((name, parts.hostname, parts.port or 80))
+
+        paths = options['paths'] or DEFAULT_PATHS
+        for name, host, port in targets:
+            if options['warmup']:
+                asyncio.run(self.run_target(host, port, paths, dict(options, duration=options['warmup'])))
+            stats = asyncio.run(self.run_target(host, port, paths, options))
+            self.report(name, stats, options)
+
+    async def run_target(self, host, port, paths, options):
+        deadline = time.monotonic() + options['duration']
+        counter = itertools.count()
+        latencies, errors = [], []
+
+        async def client(index):
+            reader = writer = None
+            while time.monotonic() < deadline:
+                path = paths[(index + next(counter)) % len(paths)]
+                if options['bust_cache']:
+                    path += ('&' if '?' in path else '?') + f'_lt={next(counter)}'
+                started = time.perf_counter()
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(host, port)
+                    status, keep_alive = await self.fetch(reader, writer, host, path)
+                except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+                    errors.append(type(exc).__name__)
+                    if writer is not None:
+                        writer.close()
+                    reader = writer = None
+                    continue
+                if status >= 400:
+                    errors.append(str(status))
+                else:
+                    latencies.append(time.perf_counter() - started)
+                if not keep_alive:
+                    writer.close()
+                    reader = writer = None
+            if writer is not None:
+                writer.close()
+
+        started = time.monotonic()
+        await asyncio.gather(*(client(i) for i in range(options['concurrency'])))
+        elapsed = time.monotonic() - started
+        return {
+            'requests': len(latencies),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+            'p90_ms': statistics.quantiles(latencies, n=10)[8] * 1000 if len(latencies) > 1 else 0,
+            'p99_ms': statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) > 1 else 0,
+            'max_ms': max(latencies) * 1000 if latencies else 0,
+            'errors': len(errors),
+            'error_kinds': sorted(set(errors)),
+        }
+
+    async def fetch(self, reader, writer, host, path):
+        """Send one GET over the connection and read the whole response. Returns (status, keep_alive)."""
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: identity\r\n'
+            f'Connection: keep-alive\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by server')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif status not in (204, 304):
+            await reader.read()
+            keep_alive = False
+        return status, keep_alive
+
+    def report(self, name, stats, options):
+        self.stdout.write(
+            f"{name:>8}: {stats['rps']:8.0f} req/s  p50 {stats['p50_ms']:7.1f} ms  "
+            f"p90 {stats['p90_ms']:7.1f} ms  p99 {stats['p99_ms']:7.1f} ms  max {stats['max_ms']:8.1f} ms  "
+            f"({stats['requests']} ok, {stats['errors']} errors"
+            + (f": {', '.join(stats['error_kinds'])}" if stats['error_kinds'] else '')
+            + f", {options['concurrency']} connections)"
+        )
@@ -0,0 +1,143 @@
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.base import Template
+from django.template.loader_tags import BlockNode
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver, reverse
+
+from portfolio.export import render_url
+from portfolio.models import Project, BlogPost
+
+
+TEMPLATE_NAME_RE = re.compile(r'''['"]([\w./-]+\.html)['"]''')
+TEMPLATE_TAG_RE = re.compile(r'''\{%\s*(?:extends|include)\s+['"]([^'"]+)['"]''')
+
+
+@contextmanager
+def timed_rendering():
+    """Record inclusive render times (ns) of every template and block rendered inside the block."""
+    timings = defaultdict(list)
+    template_render, block_render = Template._render, BlockNode.render
+
+    def render_template(self, context):
+        started = time.perf_counter_ns()
+        try:
+            return template_render(self, context)
+        finally:
+            timings[self.origin.template_name or self.name].append(time.perf_counter_ns() - started)
+
+    def render_block(self, context):
+        started = time.perf_counter_ns()
+        try:
+            return block_render(self, context)
+        finally:
+            # Labelled with the page's own template, which supplies the block's content
+            timings['%s {%% block %s %%}' % (context.template.origin.template_name, self.name)].append(
+                time.perf_counter_ns() - started
+            )
+
+    Template._render, BlockNode.render = render_template, render_block
+    try:
+        yield timings
+    finally:
+        Template._render, BlockNode.render = template_render, block_render
+
+
+def _patterns(resolver):
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _patterns(pattern)
+        else:
+            yield pattern
+
+
+class Command(BaseCommand):
+    help = 'Profile template and block render times of the public pages and list templates nothing uses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per page (default: 20)')
+        parser.add_argument('--url', action='append', dest='urls', help='Page to profile (repeatable)')
+        parser.add_argument(
+            '--cached', action='store_true',
+            help='Keep fragment caches on (each render still misses the page cache)',
+        )
+
+    def default_urls(self):
+        urls = [reverse('portfolio:%s' % name) for name in ('home', 'about', 'projects', 'skills', 'blog_list', 'contact')]
+        project = Project.objects.order_by('pk').first()
+        if project:
+            urls.append(reverse('portfolio:project_detail', kwargs={'pk': project.pk}))
+        post = BlogPost.objects.filter(published=True).order_by('pk').first()
+        if post:
+            urls.append(reverse('portfolio:blog_detail', kwargs={'slug': post.slug}))
+        return urls
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or self.default_urls()
+        overrides = {} if options['cached'] else {'PORTFOLIO_PAGE_CACHE': None}
+        pages = {}
+        with override_settings(**overrides):
+            for url in urls:
+                # Compile and warm up first, then time
+                render_url(url)
+                with timed_rendering() as timings:
+                    started = time.perf_counter_ns()
+                    for n in range(options['repeat']):
+                        separator = '&' if '?' in url else '?'
+                        # A fresh query string misses the page cache, but not the fragment caches
+                        render_url(f'{url}{separator}_profile={n}' if options['cached'] else url)
+                    pages[url] = (time.perf_counter_ns() - started) / options['repeat']
+                self.report(url, pages[url], timings, options['repeat'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\nPages (mean ms)'))
+        for url, elapsed in sorted(pages.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'{elapsed / 1e6:9.2f}  {url}')
+
+        unused = self.unreferenced_templates()
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nTemplates no view references ({len(unused)})'))
+        for name in unused:
+            self.stdout.write(f'  {name}')
+
+    def report(self, url, elapsed, timings, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{url}: {elapsed / 1e6:.2f} ms per render'))
+        rows = sorted(timings.items(), key=lambda item: -sum(item[1]))
+        for name, samples in rows:
+            mean = sum(samples) / repeat / 1e6
+            self.stdout.write(f'{mean:9.2f}  {name}' + (f'  (x{len(samples) // repeat})' if len(samples) > repeat else ''))
+
+    def unreferenced_templates(self):
+        """Templates in the project's template dirs that no view, code or other used template points at."""
+        engine = engines['django']
+        referenced = set()
+        for pattern in _patterns(get_resolver()):
+            name = getattr(getattr(pattern.callback, 'view_class', None), 'template_name', None)
+            if name:
+                referenced.add(name)
+        for path in Path(apps.get_app_config('portfolio').path).rglob('*.py'):
+            referenced.update(TEMPLATE_NAME_RE.findall(path.read_text()))
+
+        # Follow {% extends %} and {% include %} from everything in use
+        pending = list(referenced)
+        while pending:
+            name = pending.pop()
+            try:
+                source = engine.get_template(name).template.source
+            except (TemplateDoesNotExist, TemplateSyntaxError):
+                continue
+            for target in TEMPLATE_TAG_RE.findall(source):
+                if target not in referenced:
+                    referenced.add(target)
+                    pending.append(target)
+
+        existing = set()
+        for directory in engine.template_dirs:
+            for path in Path(directory).rglob('*.html'):
+                existing.add(path.relative_to(directory).as_posix())
+        return sorted(existing - referenced)
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.search import rebuild_index, search_enabled
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for projects and blog posts'
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            self.stderr.write(self.style.ERROR('Full-text search needs the SQLite backend'))
+            return
+        started = time.perf_counter()
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {count} documents in {time.perf_counter() - started:.2f}s'
+        ))
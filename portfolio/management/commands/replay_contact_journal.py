@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.ingest import replay_journal
+
+
+class Command(BaseCommand):
+    help = 'Write contact submissions left in the ingestion journal to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--include-live', action='store_true',
+            help='Also replay segments a running ingestor still holds (only when it is stopped)',
+        )
+
+    def handle(self, *args, **options):
+        segments, inserted = replay_journal(include_live=options['include_live'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed {segments} journal segments, inserted {inserted} contacts'
+        ))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from portfolio.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued contact notification emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and poll the outbox instead of draining it once',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds between polls in --loop mode (default: 5)',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Messages sent per SMTP connection (default: PORTFOLIO_OUTBOX_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain_outbox(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f'Sent {sent} messages, {failed} failed')
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
@@ -0,0 +1,83 @@
+import time
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.models import Skill
+from portfolio.vendor import (
+    CSS_PARTS, ICON_FONTS, JS_PARTS, NDOT57_FACE, SOURCES,
+    concatenate, subset_font, subset_fontawesome, used_icons, vendor_root,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Download the pinned Bootstrap, Font Awesome, AOS and ndot57 files into static/vendor, '
+        'keeping only the icons the site uses. Re-run after adding icons.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cache-dir', default=Path(settings.BASE_DIR) / 'var' / 'vendor',
+            help='Where downloads are kept between runs (default: var/vendor)',
+        )
+        parser.add_argument('--refresh', action='store_true', help='Download again even if cached')
+        parser.add_argument('--all-icons', action='store_true', help='Keep every Font Awesome icon')
+
+    def fetch(self, cache_dir, name, refresh):
+        path = cache_dir / name
+        if refresh or not path.exists():
+            request = urllib.request.Request(SOURCES[name], headers={'User-Agent': 'portfolio-vendor-assets'})
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    data = response.read()
+            except OSError as exc:
+                raise CommandError(f'Could not download {SOURCES[name]}: {exc}')
+            path.write_bytes(data)
+        return path.read_bytes()
+
+    def write(self, path, data):
+        # Leave unchanged files alone so collectstatic doesn't recopy them
+        if path.exists() and path.read_bytes() == data:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        cache_dir = Path(options['cache_dir'])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        files = {name: self.fetch(cache_dir, name, options['refresh']) for name in SOURCES}
+        root = vendor_root()
+
+        css = {name: files[name].decode('utf-8') for name in CSS_PARTS}
+        icons = None if options['all_icons'] else used_icons(Skill.objects.values_list('icon_class', flat=True))
+        glyphs_before = css['fontawesome.min.css'].count('{content:')
+        css['fontawesome.min.css'], codepoints = subset_fontawesome(css['fontawesome.min.css'], icons)
+        glyphs_after = css['fontawesome.min.css'].count('{content:')
+
+        vendor_css = concatenate([NDOT57_FACE] + [css[name] for name in CSS_PARTS], charset=True).encode()
+        vendor_js = concatenate([files[name].decode('utf-8') for name in JS_PARTS]).encode()
+        self.write(root / 'vendor.css', vendor_css)
+        self.write(root / 'vendor.js', vendor_js)
+        self.write(root / 'fonts' / 'ndot57.ttf', files['ndot57.ttf'])
+
+        fonts_before = fonts_after = 0
+        for name in ICON_FONTS:
+            data = files[name] if icons is None else subset_font(files[name], codepoints)
+            fonts_before += len(files[name])
+            fonts_after += len(data)
+            self.write(root / 'webfonts' / name, data)
+        if icons is not None and fonts_after == fonts_before:
+            self.stderr.write('fonttools/brotli not installed: icon fonts were copied without subsetting')
+
+        source_bytes = sum(len(files[name]) for name in CSS_PARTS + JS_PARTS)
+        self.stdout.write(f'Font Awesome: kept {glyphs_after} of {glyphs_before} glyph rules')
+        self.stdout.write(f'Icon fonts: {fonts_before} -> {fonts_after} bytes')
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {root} (CSS+JS {source_bytes} -> {len(vendor_css) + len(vendor_js)} bytes) '
+            f'in {time.perf_counter() - started:.1f}s; run collectstatic to hash them'
+        ))
+
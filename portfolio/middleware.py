@@ -0,0 +1,135 @@
+import os
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import FileResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+
+from .compression import SUFFIXES, preferred_encoding
+from .snapshot import acquire_snapshot, release_snapshot, snapshot_alias
+
+
+class SnapshotReadsMiddleware:
+    """
+    Serve the reads of public GET and HEAD requests from the in-memory
+    snapshot (see portfolio/snapshot.py). The admin always reads from the
+    default database, so it never shows a copy older than its own writes.
+    Static and media files never query the database and are left alone.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.skipped_prefixes = None
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def is_public_read(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if self.skipped_prefixes is None:
+            self.skipped_prefixes = tuple(
+                prefix for prefix in (reverse('admin:index'), settings.STATIC_URL, settings.MEDIA_URL) if prefix
+            )
+        return not request.path.startswith(self.skipped_prefixes)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        alias = acquire_snapshot() if self.is_public_read(request) else None
+        if alias is None:
+            return self.get_response(request)
+        token = snapshot_alias.set(alias)
+        try:
+            return self.get_response(request)
+        finally:
+            snapshot_alias.reset(token)
+            release_snapshot(alias)
+
+    async def __acall__(self, request):
+        alias = None
+        if self.is_public_read(request):
+            alias = await sync_to_async(acquire_snapshot)()
+        if alias is None:
+            return await self.get_response(request)
+        token = snapshot_alias.set(alias)
+        try:
+            return await self.get_response(request)
+        finally:
+            snapshot_alias.reset(token)
+            release_snapshot(alias)
+
+
+class PrecompressedMiddleware:
+    """
+    Serve the compressed variant of a response that the client accepts,
+    without compressing anything here (see portfolio/compression.py):
+
+    * HTML from the page cache carries ``precompressed`` bodies;
+    * file responses are swapped for a ``.br``/``.gz`` sibling of their file.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code != 200:
+            return response
+        if getattr(response, 'precompressed', None):
+            return self.use_precompressed(request, response)
+        if isinstance(response, FileResponse) and 'Range' not in request.headers:
+            return self.use_sibling(request, response)
+        return response
+
+    def encoded(self, response, encoding):
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The bytes differ from the identity body's
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def use_precompressed(self, request, response):
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = preferred_encoding(request, response.precompressed)
+        if encoding is None:
+            return response
+        response.content = response.precompressed[encoding]
+        response.headers['Content-Length'] = str(len(response.content))
+        return self.encoded(response, encoding)
+
+    def use_sibling(self, request, response):
+        filename = getattr(response.file_to_stream, 'name', None)
+        if not isinstance(filename, str):
+            return response
+        offered = {encoding for encoding, suffix in SUFFIXES.items() if os.path.isfile(filename + suffix)}
+        if not offered:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = preferred_encoding(request, offered)
+        if encoding is None:
+            return response
+        # Setting the content re-derives these headers from the sibling's name
+        kept = {name: response.headers.get(name) for name in ('Content-Type', 'Content-Disposition')}
+        response.file_to_stream.close()
+        response.streaming_content = open(filename + SUFFIXES[encoding], 'rb')
+        for name, value in kept.items():
+            if value is None:
+                response.headers.pop(name, None)
+            else:
+                response.headers[name] = value
+        return self.encoded(response, encoding)
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_technologies(apps, schema_editor):
+    Project = apps.get_model('portfolio', 'Project')
+    Technology = apps.get_model('portfolio', 'Technology')
+    ProjectTechnology = apps.get_model('portfolio', 'ProjectTechnology')
+
+    technologies = {}
+    links = []
+    for project in Project.objects.only('pk', 'technologies'):
+        names = [name.strip() for name in project.technologies.split(',') if name.strip()]
+        for position, name in enumerate(dict.fromkeys(names)):
+            if name not in technologies:
+                technologies[name] = Technology.objects.create(name=name)
+            links.append(ProjectTechnology(
+                project_id=project.pk, technology=technologies[name], position=position,
+            ))
+    ProjectTechnology.objects.bulk_create(links)
+
+
+def join_technologies(apps, schema_editor):
+    Project = apps.get_model('portfolio', 'Project')
+    ProjectTechnology = apps.get_model('portfolio', 'ProjectTechnology')
+
+    names = {}
+    for link in ProjectTechnology.objects.select_related('technology').order_by('project_id', 'position'):
+        names.setdefault(link.project_id, []).append(link.technology.name)
+    for project_id, project_names in names.items():
+        Project.objects.filter(pk=project_id).update(technologies=', '.join(project_names))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_siteconfiguration_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Technology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Technologies',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTechnology',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='technology_links', to='portfolio.project')),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_links', to='portfolio.technology')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='projecttechnology',
+            constraint=models.UniqueConstraint(fields=('technology', 'project'), name='unique_project_technology'),
+        ),
+        migrations.RunPython(split_technologies, join_technologies),
+        # A default lets the reverse migration re-add the column to existing rows
+        migrations.AlterField(
+            model_name='project',
+            name='technologies',
+            field=models.CharField(default='', help_text='Comma-separated list of technologies', max_length=500),
+        ),
+        migrations.RemoveField(
+            model_name='project',
+            name='technologies',
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='technologies',
+            field=models.ManyToManyField(blank=True, related_name='projects', through='portfolio.ProjectTechnology', to='portfolio.technology'),
+        ),
+    ]
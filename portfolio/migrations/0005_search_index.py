@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS portfolio_search_index USING fts5("
+        "kind UNINDEXED, object_id UNINDEXED, title, body, "
+        "tokenize = 'porter unicode61 remove_diacritics 2')"
+    )
+
+    Project = apps.get_model('portfolio', 'Project')
+    BlogPost = apps.get_model('portfolio', 'BlogPost')
+    rows = []
+    for project in Project.objects.prefetch_related('technology_links__technology'):
+        technologies = ' '.join(link.technology.name for link in project.technology_links.all())
+        body = '\n'.join([project.short_description, project.description, technologies])
+        rows.append(('project', project.pk, project.title, body))
+    for post in BlogPost.objects.filter(published=True):
+        rows.append(('blogpost', post.pk, post.title, '\n'.join([post.excerpt, post.content])))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO portfolio_search_index (kind, object_id, title, body) VALUES (%s, %s, %s, %s)',
+            rows,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS portfolio_search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+# ContactAdmin searches name, email and subject by prefix (istartswith).
+# SQLite's LIKE only uses an index built with NOCASE; PostgreSQL's
+# UPPER(...) LIKE needs a pattern_ops expression index.
+FIELDS = ['name', 'email', 'subject']
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for field in FIELDS:
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                'CREATE INDEX IF NOT EXISTS contact_%s_nocase_idx ON portfolio_contact (%s COLLATE NOCASE)'
+                % (field, field)
+            )
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                'CREATE INDEX IF NOT EXISTS contact_%s_prefix_idx ON portfolio_contact '
+                '(UPPER(%s::text) text_pattern_ops)' % (field, field)
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for field in FIELDS:
+        if vendor == 'sqlite':
+            schema_editor.execute('DROP INDEX IF EXISTS contact_%s_nocase_idx' % field)
+        elif vendor == 'postgresql':
+            schema_editor.execute('DROP INDEX IF EXISTS contact_%s_prefix_idx' % field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+# Re-key the search documents by a rowid derived from (kind, object_id), so
+# search.py replaces them by rowid instead of scanning the UNINDEXED columns.
+# Must match search.KIND_CODES and KIND_SLOTS.
+REKEY = [
+    'CREATE TEMP TABLE search_documents AS SELECT kind, object_id, title, body FROM portfolio_search_index',
+    'DELETE FROM portfolio_search_index',
+    "INSERT INTO portfolio_search_index (rowid, kind, object_id, title, body) "
+    "SELECT object_id * 16 + CASE kind WHEN 'project' THEN 0 ELSE 1 END, kind, object_id, title, body "
+    "FROM search_documents",
+    'DROP TABLE search_documents',
+]
+
+
+def rekey_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in REKEY:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_contact_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_search_index, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,29 @@
-from django.db import models
+from django.db import connections, models, router
 from django.urls import reverse
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 
+class Technology(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'Technologies'
+    
+    def __str__(self):
+        return self.name
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_technologies(self):
+        # One extra query for every project's technologies, in display order
+        return self.prefetch_related(models.Prefetch(
+            'technology_links',
+            queryset=ProjectTechnology.objects.select_related('technology'),
+        ))
+
+
 class Project(models.Model):
     CATEGORY_CHOICES = [
         ('web', 'Web Development'),
@@ -18,22 +38,97 @@ class Project(models.Model):
     description = models.TextField()
     short_description = models.CharField(max_length=300, help_text="Brief description for cards")
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='web')
-    technologies = models.CharField(max_length=500, help_text="Comma-separated list of technologies")
+    technologies = models.ManyToManyField(
+        Technology, through='ProjectTechnology', related_name='projects', blank=True
+    )
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
+    # Responsive derivatives of image, see portfolio/images.py
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     demo_url = models.URLField(blank=True, null=True)
     github_url = models.URLField(blank=True, null=True)
     featured = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-featured', '-created_at']
+        indexes = [
+            # Default ordering, also HomeView's featured=True lookup
+            models.Index(fields=['-featured', '-created_at'], name='project_featured_created_idx'),
+            # ProjectsView ?category= filter in default ordering
+            models.Index(fields=['category', '-featured', '-created_at'], name='project_category_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
     def get_technologies_list(self):
-        return [tech.strip() for tech in self.technologies.split(',') if tech.strip()]
+        # Served from the with_technologies() prefetch when the view used it
+        return [link.technology.name for link in self.technology_links.all()]
+    
+    def set_technologies(self, names):
+        """Replace this project's technologies with ``names``, keeping their order."""
+        names = list(dict.fromkeys(name.strip() for name in names if name.strip()))
+        existing = {tech.name: tech for tech in Technology.objects.filter(name__in=names)}
+        missing = [Technology(name=name) for name in names if name not in existing]
+        for tech in Technology.objects.bulk_create(missing):
+            existing[tech.name] = tech
+        # bulk_create doesn't return pks on every backend; re-read if needed
+        if any(tech.pk is None for tech in existing.values()):
+            existing = {tech.name: tech for tech in Technology.objects.filter(name__in=names)}
+        ProjectTechnology.objects.filter(project=self).delete_unsignalled()
+        ProjectTechnology.objects.bulk_create([
+            ProjectTechnology(project=self, technology=existing[name], position=position)
+            for position, name in enumerate(names)
+        ])
+        # Neither write sends the per-link signals, so the project is refreshed once here
+        from .signals import touch_projects
+        touch_projects([self.pk])
+
+
+class ProjectTechnologyQuerySet(models.QuerySet):
+    def delete_unsignalled(self):
+        """
+        Delete the links in one statement, without a post_delete (and so a
+        project refresh) per link. For bulk relinks, whose caller refreshes
+        the projects once afterwards.
+        """
+        # QuerySet.delete() collects the rows and sends post_delete for each
+        # whenever receivers are connected (signals.py connects them), so
+        # the DELETE is issued directly
+        db = router.db_for_write(self.model)
+        connection = connections[db]
+        subquery, params = self.using(db).values('pk').query.get_compiler(db).as_sql()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM %s WHERE %s IN (%s)' % (
+                    connection.ops.quote_name(self.model._meta.db_table),
+                    connection.ops.quote_name(self.model._meta.pk.column),
+                    subquery,
+                ),
+                params,
+            )
+            return cursor.rowcount
+
+
+class ProjectTechnology(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='technology_links')
+    technology = models.ForeignKey(Technology, on_delete=models.CASCADE, related_name='project_links')
+    position = models.PositiveSmallIntegerField(default=0)
+    
+    objects = ProjectTechnologyQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['position']
+        constraints = [
+            # Leading on technology so ?tech= filters are an index range scan
+            models.UniqueConstraint(fields=['technology', 'project'], name='unique_project_technology'),
+        ]
+    
+    def __str__(self):
+        return f"{self.project} - {self.technology}"
 
 
 class Skill(models.Model):
@@ -54,6 +149,9 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['category', '-proficiency']
+        indexes = [
+            models.Index(fields=['category', '-proficiency'], name='skill_category_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.proficiency}%)"
@@ -65,12 +163,20 @@ class BlogPost(models.Model):
     content = models.TextField()
     excerpt = models.TextField(max_length=500, help_text="Brief summary for blog list")
     image = models.ImageField(upload_to='blog/', blank=True, null=True)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     published = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # BlogListView/BlogDetailView: published=True in default ordering.
+            # Partial, because boolean filters compile to a bare "WHERE published"
+            # that a (published, created_at) composite can't serve on SQLite.
+            models.Index(fields=['-created_at'], condition=models.Q(published=True),
+                         name='blogpost_published_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -86,9 +192,17 @@ class Contact(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
     read = models.BooleanField(default=False)
+    # Set by batched ingestion so journal replays never insert a message twice
+    ingest_id = models.UUIDField(unique=True, blank=True, null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='contact_created_idx'),
+            # Unread messages in default ordering, for ContactAdmin's read filter
+            models.Index(fields=['-created_at'], condition=models.Q(read=False),
+                         name='contact_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject}"
@@ -104,6 +218,7 @@ class SiteConfiguration(models.Model):
     linkedin_url = models.URLField(blank=True, null=True)
     twitter_url = models.URLField(blank=True, null=True)
     resume_file = models.FileField(upload_to='documents/', blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = "Site Configuration"
@@ -116,3 +231,33 @@ class SiteConfiguration(models.Model):
         if not self.pk and SiteConfiguration.objects.exists():
             raise ValidationError('There can be only one SiteConfiguration instance')
         return super().save(*args, **kwargs)
+
+
+class OutboxMessage(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=300)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # The worker's "what is due" query
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status='pending'),
+                         name='outbox_due_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
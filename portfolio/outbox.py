@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_contact_notification(contact, recipient):
+    return OutboxMessage(
+        subject=f"Portfolio Contact: {contact.subject}",
+        body=f"Name: {contact.name}\n"
+             f"Email: {contact.email}\n"
+             f"Message: {contact.message}",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipients=[recipient],
+    )
+
+
+def queue_contact_notification(contact, recipient):
+    """
+    Record the notification for a new Contact in the outbox. Call inside the
+    transaction that saves ``contact`` so both commit or neither does.
+    """
+    message = build_contact_notification(contact, recipient)
+    message.save()
+    return message
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'PORTFOLIO_OUTBOX_RETRY_DELAY', 30)
+    cap = getattr(settings, 'PORTFOLIO_OUTBOX_MAX_RETRY_DELAY', 60 * 60)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def claim_batch(batch_size, lease_seconds=300):
+    """
+    Claim up to ``batch_size`` due messages by pushing their next attempt into
+    the future, so a second worker (or a crash mid-send) can't double-send
+    them before the lease runs out.
+    """
+    now = timezone.now()
+    ids = list(
+        OutboxMessage.objects.filter(status='pending', next_attempt_at__lte=now)
+        .order_by('next_attempt_at').values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    lease = now + timedelta(seconds=lease_seconds)
+    OutboxMessage.objects.filter(pk__in=ids, status='pending', next_attempt_at__lte=now).update(
+        next_attempt_at=lease,
+    )
+    return list(OutboxMessage.objects.filter(pk__in=ids, next_attempt_at=lease))
+
+
+def send_batch(messages):
+    """
+    Send ``messages`` over a single mail connection and record the outcome of
+    each one. Returns ``(sent, failed)`` counts.
+    """
+    max_attempts = getattr(settings, 'PORTFOLIO_OUTBOX_MAX_ATTEMPTS', 8)
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        # Server unreachable: every message in the batch gets the same error
+        opened, open_error = False, exc
+    else:
+        opened, open_error = True, None
+
+    try:
+        for message in messages:
+            message.attempts += 1
+            try:
+                if not opened:
+                    raise open_error
+                EmailMessage(
+                    subject=message.subject, body=message.body,
+                    from_email=message.from_email, to=message.recipients,
+                    connection=connection,
+                ).send()
+            except Exception as exc:
+                failed += 1
+                message.last_error = f'{type(exc).__name__}: {exc}'
+                if message.attempts >= max_attempts:
+                    message.status = 'failed'
+                else:
+                    message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+            else:
+                sent += 1
+                message.status = 'sent'
+                message.sent_at = timezone.now()
+                message.last_error = ''
+    finally:
+        if opened:
+            connection.close()
+
+    OutboxMessage.objects.bulk_update(
+        messages, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'],
+    )
+    return sent, failed
+
+
+def drain_outbox(batch_size=None):
+    """Send every due message, one batch at a time. Returns ``(sent, failed)`` totals."""
+    batch_size = batch_size or getattr(settings, 'PORTFOLIO_OUTBOX_BATCH_SIZE', 50)
+    total_sent = total_failed = 0
+    while True:
+        batch = claim_batch(batch_size)
+        if not batch:
+            return total_sent, total_failed
+        sent, failed = send_batch(batch)
+        total_sent += sent
+        total_failed += failed
+
+
+def _drain_in_worker(batch_size):
+    try:
+        return drain_outbox(batch_size)
+    finally:
+        # Worker threads outlive the request cycle that normally closes these
+        close_old_connections()
+
+
+async def adrain_outbox(batch_size=None):
+    """``drain_outbox()`` in a worker thread, so SMTP never blocks the event loop."""
+    return await sync_to_async(_drain_in_worker, thread_sensitive=False)(batch_size)
+
+
+_background_drains = set()
+
+
+def drain_outbox_soon():
+    """
+    Start delivering due messages in the background of the running event
+    loop. Whatever fails here stays in the outbox for send_outbox to retry.
+    """
+    async def drain():
+        try:
+            await adrain_outbox()
+        except Exception:
+            logger.exception('Background outbox delivery failed')
+
+    task = asyncio.get_running_loop().create_task(drain())
+    # The loop only keeps weak references to tasks
+    _background_drains.add(task)
+    task.add_done_callback(_background_drains.discard)
+    return task
@@ -0,0 +1,203 @@
+import base64
+import binascii
+import collections.abc
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage(collections.abc.Sequence):
+    """
+    One page of a CursorPaginator. Quacks like django.core.paginator.Page for
+    templates that only iterate or check has_next/has_previous, and adds the
+    opaque ``next_cursor``/``previous_cursor`` tokens.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<CursorPage of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator: each page is fetched with a range condition on
+    ``ordering`` instead of OFFSET, and no COUNT(*) is run, so page N costs
+    the same as page 1. ``ordering`` must be a unique, indexed sort key,
+    e.g. ``['-created_at', 'id']``.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = int(per_page)
+        self.keys = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+    def encode_cursor(self, direction, obj):
+        values = []
+        for name, _desc in self.keys:
+            value = getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps([direction, values], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, values = json.loads(raw)
+            if direction not in ('n', 'p') or len(values) != len(self.keys):
+                raise ValueError
+            model = self.queryset.model
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _desc), value in zip(self.keys, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise InvalidCursor('Invalid cursor')
+        return direction, values
+
+    def _seek(self, values, backwards):
+        # (a, b, c) after (x, y, z) in sort order, expanded per key so mixed
+        # ASC/DESC directions work: a>x OR (a=x AND b>y) OR (a=x AND b=y AND c>z)
+        clauses = []
+        for i, (name, desc) in enumerate(self.keys):
+            lookup = 'lt' if desc != backwards else 'gt'
+            condition = {prev: value for (prev, _d), value in zip(self.keys[:i], values)}
+            condition['%s__%s' % (name, lookup)] = values[i]
+            clauses.append(Q(**condition))
+        # Redundant bound on the leading key lets the index seek instead of scan
+        name, desc = self.keys[0]
+        bound = Q(**{'%s__%s' % (name, 'lte' if desc != backwards else 'gte'): values[0]})
+        return bound & reduce(or_, clauses)
+
+    def _page_query(self, cursor):
+        direction, values = self.decode_cursor(cursor) if cursor else ('n', None)
+        backwards = direction == 'p'
+
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backwards))
+        if backwards:
+            queryset = queryset.reverse()
+        return queryset[:self.per_page + 1], values, backwards
+
+    def page(self, cursor=None):
+        queryset, values, backwards = self._page_query(cursor)
+        return self._build_page(list(queryset), values, backwards)
+
+    async def apage(self, cursor=None):
+        queryset, values, backwards = self._page_query(cursor)
+        return self._build_page([row async for row in queryset], values, backwards)
+
+    def _build_page(self, rows, values, backwards):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        # Walking forwards there is more ahead only if we over-fetched, and
+        # something behind whenever we started from a cursor; mirrored backwards.
+        more_ahead, more_behind = (True, has_more) if backwards else (has_more, values is not None)
+        next_cursor = previous_cursor = None
+        if rows:
+            if more_ahead:
+                next_cursor = self.encode_cursor('n', rows[-1])
+            if more_behind:
+                previous_cursor = self.encode_cursor('p', rows[0])
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in keyset pagination for ListView. Requests carrying ``?cursor=`` are
+    always paginated by cursor; with ``PORTFOLIO_CURSOR_PAGINATION = True``
+    the first page is too, so listings never run COUNT(*) or OFFSET.
+    Otherwise Django's offset paginator (``?page=``) is used unchanged.
+    """
+    cursor_ordering = None
+    cursor_query_param = 'cursor'
+
+    def use_cursor_pagination(self):
+        return (
+            self.cursor_query_param in self.request.GET
+            or getattr(settings, 'PORTFOLIO_CURSOR_PAGINATION', False)
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Async counterpart of ``paginate_queryset()`` for async list views."""
+        if not self.use_cursor_pagination():
+            return await apaginate_offset(self, queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = await paginator.apage(self.request.GET.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise Http404('Invalid cursor')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+async def apaginate_offset(view, queryset, page_size):
+    """
+    MultipleObjectMixin.paginate_queryset() for async views: the COUNT(*) and
+    the page's rows are fetched with the async ORM.
+    """
+    paginator = view.get_paginator(
+        queryset, page_size, orphans=view.get_paginate_orphans(),
+        allow_empty_first_page=view.get_allow_empty(),
+    )
+    paginator.count = await queryset.acount()
+    page_number = view.kwargs.get(view.page_kwarg) or view.request.GET.get(view.page_kwarg) or 1
+    try:
+        page_number = int(page_number)
+    except ValueError:
+        if page_number != 'last':
+            raise Http404('Page is not “last”, nor can it be converted to an int.')
+        page_number = paginator.num_pages
+    try:
+        number = paginator.validate_number(page_number)
+    except InvalidPage as exc:
+        raise Http404('Invalid page (%s): %s' % (page_number, exc))
+    bottom = (number - 1) * paginator.per_page
+    top = bottom + paginator.per_page
+    if top + paginator.orphans >= paginator.count:
+        top = paginator.count
+    object_list = [obj async for obj in queryset[bottom:top]]
+    page = paginator._get_page(object_list, number, paginator)
+    return paginator, page, object_list, page.has_other_pages()
@@ -0,0 +1,27 @@
+from .snapshot import SNAPSHOT_ALIASES, SNAPSHOT_MODELS, snapshot_alias
+
+
+class SnapshotRouter:
+    """
+    Send reads of the public content models to the in-memory snapshot while
+    SnapshotReadsMiddleware has marked the request as read-only. Everything
+    else, including all writes, goes to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model in SNAPSHOT_MODELS:
+            return snapshot_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Snapshot rows are copies of default rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Snapshots copy their schema from the default database
+        if db in SNAPSHOT_ALIASES:
+            return False
+        return None
@@ -0,0 +1,181 @@
+"""
+Full-text search over projects and published blog posts, backed by an SQLite
+FTS5 table (created in migration 0005) that signals keep in sync with the
+Project and BlogPost rows. On other database backends search is disabled
+and every function here is a no-op.
+"""
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Project, BlogPost
+
+
+SEARCH_TABLE = 'portfolio_search_index'
+
+# Column weights for bm25(): kind, object_id, title, body
+BM25_WEIGHTS = (0.0, 0.0, 10.0, 1.0)
+
+# Each document's rowid is derived from its kind and pk (see document_rowid),
+# so it is replaced by rowid: kind and object_id are UNINDEXED columns, and a
+# lookup on them scans the whole table.
+KIND_CODES = {'project': 0, 'blogpost': 1}
+KIND_SLOTS = 16
+
+# Control characters can't occur in indexed text, so they safely mark the
+# snippet highlights until the text has been HTML-escaped.
+_MARK_START, _MARK_END = '\x02', '\x03'
+
+
+@dataclass
+class SearchResult:
+    kind: str
+    object: object
+    title: str
+    snippet: str
+    rank: float
+
+
+def search_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def _project_document(project):
+    body = '\n'.join([
+        project.short_description, project.description,
+        ' '.join(project.get_technologies_list()),
+    ])
+    return project.title, body
+
+
+def _post_document(post):
+    return post.title, '\n'.join([post.excerpt, post.content])
+
+
+def document_rowid(kind, object_id):
+    return int(object_id) * KIND_SLOTS + KIND_CODES[kind]
+
+
+def _replace(cursor, kind, object_id, title, body):
+    rowid = document_rowid(kind, object_id)
+    cursor.execute('DELETE FROM %s WHERE rowid = %%s' % SEARCH_TABLE, [rowid])
+    if title is not None:
+        cursor.execute(
+            'INSERT INTO %s (rowid, kind, object_id, title, body) VALUES (%%s, %%s, %%s, %%s, %%s)'
+            % SEARCH_TABLE,
+            [rowid, kind, object_id, title, body],
+        )
+
+
+def index_project(project):
+    if search_enabled():
+        with connection.cursor() as cursor:
+            _replace(cursor, 'project', project.pk, *_project_document(project))
+
+
+def index_blog_post(post):
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        if post.published:
+            _replace(cursor, 'blogpost', post.pk, *_post_document(post))
+        else:
+            _replace(cursor, 'blogpost', post.pk, None, None)
+
+
+def remove_from_index(kind, object_id):
+    if search_enabled():
+        with connection.cursor() as cursor:
+            _replace(cursor, kind, object_id, None, None)
+
+
+@transaction.atomic
+def rebuild_index():
+    """Repopulate the whole index from the database. Returns the number of documents."""
+    if not search_enabled():
+        return 0
+    rows = [
+        (document_rowid('project', project.pk), 'project', project.pk, *_project_document(project))
+        for project in Project.objects.with_technologies()
+    ] + [
+        (document_rowid('blogpost', post.pk), 'blogpost', post.pk, *_post_document(post))
+        for post in BlogPost.objects.filter(published=True)
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM %s' % SEARCH_TABLE)
+        cursor.executemany(
+            'INSERT INTO %s (rowid, kind, object_id, title, body) VALUES (%%s, %%s, %%s, %%s, %%s)'
+            % SEARCH_TABLE,
+            rows,
+        )
+        cursor.execute("INSERT INTO %s (%s) VALUES ('optimize')" % (SEARCH_TABLE, SEARCH_TABLE))
+    return len(rows)
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, the last one as
+    a prefix so results show up while typing. Words are quoted, so FTS5
+    operators in user input are searched for literally.
+    """
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        return ''
+    terms = ['"%s"' % word for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def matching_ids_sql(kind, text):
+    """
+    ``(sql, params)`` selecting the ids of indexed ``kind`` documents that
+    match ``text``, for a ``pk__in=RawSQL(...)`` subquery; None when there is
+    nothing to search or no index.
+    """
+    match = build_match_query(text)
+    if not match or not search_enabled():
+        return None
+    return (
+        'SELECT object_id FROM %s WHERE kind = %%s AND %s MATCH %%s' % (SEARCH_TABLE, SEARCH_TABLE),
+        [kind, match],
+    )
+
+
+def _highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(_MARK_START, '<mark>').replace(_MARK_END, '</mark>')
+    )
+
+
+def search(text, limit=20):
+    """Return up to ``limit`` SearchResults for ``text``, best BM25 rank first."""
+    match = build_match_query(text)
+    if not match or not search_enabled():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT kind, object_id, snippet(%s, 3, %%s, %%s, '…', 24), bm25(%s, %s) AS rank "
+            "FROM %s WHERE %s MATCH %%s ORDER BY rank LIMIT %%s"
+            % (SEARCH_TABLE, SEARCH_TABLE, ', '.join(map(str, BM25_WEIGHTS)),
+               SEARCH_TABLE, SEARCH_TABLE),
+            [_MARK_START, _MARK_END, match, limit],
+        )
+        hits = cursor.fetchall()
+
+    # Two lookups in total, however many hits
+    ids = {'project': [], 'blogpost': []}
+    for kind, object_id, _snippet, _rank in hits:
+        ids[kind].append(object_id)
+    objects = {
+        'project': Project.objects.in_bulk(ids['project']),
+        'blogpost': BlogPost.objects.filter(published=True).in_bulk(ids['blogpost']),
+    }
+
+    results = []
+    for kind, object_id, snippet, rank in hits:
+        obj = objects[kind].get(object_id)
+        if obj is not None:
+            results.append(SearchResult(kind, obj, obj.title, _highlight(snippet), rank))
+    return results
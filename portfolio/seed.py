@@ -0,0 +1,255 @@
+"""
+Seed data for ``manage.py populate_portfolio``.
+
+A seed file (YAML or JSON, see data/portfolio.yaml) holds the site
+configuration, projects, skills and blog posts. Each model is diffed against
+the database in one query, matched on a natural key, and only missing rows
+(or, with ``update=True``, changed ones) are written, with bulk_create/bulk_update inside one
+transaction. Bulk writes don't send model signals, so the page cache, search
+index and snapshot they would have refreshed are refreshed once at the end.
+"""
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import bump_page_groups
+from .images import needs_renditions, schedule_renditions
+from .models import BlogPost, Project, ProjectTechnology, SiteConfiguration, Skill, Technology
+from .search import rebuild_index
+from .snapshot import mark_snapshot_stale
+
+
+DEFAULT_SEED = Path(__file__).resolve().parent / 'data' / 'portfolio.yaml'
+
+BATCH_SIZE = 500
+
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Section -> (model, natural key)
+SEED_MODELS = {
+    'projects': (Project, 'title'),
+    'skills': (Skill, 'name'),
+    'blog_posts': (BlogPost, 'slug'),
+}
+
+
+class SeedError(Exception):
+    pass
+
+
+@dataclass
+class SectionReport:
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    unchanged: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def changed(self):
+        return bool(self.created or self.updated)
+
+
+def load_seed(path):
+    """Parse a ``.json``, ``.yaml`` or ``.yml`` seed file."""
+    path = Path(path)
+    try:
+        text = path.read_text(encoding='utf-8')
+        # The libyaml loader, where PyYAML was built with it, is much faster
+        data = json.loads(text) if path.suffix == '.json' else yaml.load(text, Loader=_YAML_LOADER)
+    except (OSError, ValueError, yaml.YAMLError) as exc:
+        raise SeedError(f'Could not read {path}: {exc}')
+    if not isinstance(data, dict):
+        raise SeedError(f'{path}: expected a mapping of sections')
+    unknown = set(data) - set(SEED_MODELS) - {'site'}
+    if unknown:
+        raise SeedError(f'{path}: unknown sections {", ".join(sorted(unknown))}')
+    return data
+
+
+def _field_values(model, row, extra=()):
+    """``row`` converted by the model's own fields; ``extra`` keys are passed through."""
+    if not isinstance(row, dict):
+        raise SeedError(f'{model.__name__}: expected a mapping, got {row!r}')
+    fields = {f.name: f for f in model._meta.concrete_fields if f.editable and not f.primary_key}
+    values = {}
+    for name, value in row.items():
+        if name in extra:
+            values[name] = value
+        elif name in fields:
+            try:
+                values[name] = fields[name].to_python(value)
+            except ValidationError as exc:
+                raise SeedError(f'{model.__name__}.{name}: {"; ".join(exc.messages)}')
+        else:
+            raise SeedError(f'{model.__name__}: unknown field {name!r}')
+    return values
+
+
+def _technology_names(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    return list(dict.fromkeys(name.strip() for name in value or () if name.strip()))
+
+
+def _sync_rows(model, key, rows, now, extra=(), update=False):
+    """
+    Create missing ``model`` rows from ``rows`` and, with ``update``, bring
+    existing ones in line; returns (report, objects by key, extras).
+    """
+    report = SectionReport()
+    wanted, extras = {}, {}
+    for row in rows:
+        values = _field_values(model, row, extra)
+        if not values.get(key):
+            raise SeedError(f'{model.__name__}: every entry needs a {key!r}')
+        extras[values[key]] = {name: values.pop(name) for name in extra if name in values}
+        wanted[values[key]] = values
+
+    objects = {}
+    for obj in model.objects.filter(**{key + '__in': list(wanted)}).order_by('pk'):
+        objects.setdefault(getattr(obj, key), obj)
+
+    auto_now = [f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+    update_fields = set()
+    for natural_key, values in wanted.items():
+        obj = objects.get(natural_key)
+        if obj is None:
+            report.created.append(model(**values))
+            continue
+        if not update:
+            report.skipped += 1
+            continue
+        changed = [name for name, value in values.items() if getattr(obj, name) != value]
+        if not changed:
+            report.unchanged += 1
+            continue
+        for name in changed:
+            setattr(obj, name, values[name])
+        # bulk_update() doesn't run pre_save(), so auto_now fields are set here
+        for name in auto_now:
+            setattr(obj, name, now)
+        update_fields.update(changed, auto_now)
+        report.updated.append(obj)
+
+    model.objects.bulk_create(report.created, batch_size=BATCH_SIZE)
+    if report.updated:
+        model.objects.bulk_update(report.updated, sorted(update_fields), batch_size=BATCH_SIZE)
+    if any(obj.pk is None for obj in report.created):
+        # Backends that can't return pks from bulk_create
+        created = {getattr(obj, key) for obj in report.created}
+        report.created = list(model.objects.filter(**{key + '__in': created}))
+    objects.update((getattr(obj, key), obj) for obj in report.created)
+    return report, objects, extras
+
+
+def _sync_technologies(projects, wanted, now):
+    """Relink projects whose technology list differs. Returns the pks of projects that changed."""
+    current = defaultdict(list)
+    links = ProjectTechnology.objects.filter(project__in=[p.pk for p in projects.values()])
+    for project_id, name in links.order_by('project_id', 'position').values_list('project_id', 'technology__name'):
+        current[project_id].append(name)
+    changed = {
+        projects[title].pk: names for title, names in wanted.items()
+        if current[projects[title].pk] != names
+    }
+    if not changed:
+        return set()
+
+    names = {name for project_names in changed.values() for name in project_names}
+    existing = set(Technology.objects.filter(name__in=names).values_list('name', flat=True))
+    Technology.objects.bulk_create([Technology(name=name) for name in sorted(names - existing)])
+    technology_ids = dict(Technology.objects.filter(name__in=names).values_list('name', 'pk'))
+    # No per-link signals: _after_bulk_writes() refreshes these projects once
+    ProjectTechnology.objects.filter(project__in=changed).delete_unsignalled()
+    ProjectTechnology.objects.bulk_create([
+        ProjectTechnology(project_id=project_id, technology_id=technology_ids[name], position=position)
+        for project_id, project_names in changed.items()
+        for position, name in enumerate(project_names)
+    ], batch_size=BATCH_SIZE)
+    # The links are part of the project, so it counts as updated
+    Project.objects.filter(pk__in=changed).update(updated_at=now)
+    return set(changed)
+
+
+def _sync_site(values, update=False):
+    """Create (or, with ``update``, update) the SiteConfiguration row; a normal save() so its signals run."""
+    values = _field_values(SiteConfiguration, values)
+    config = SiteConfiguration.objects.order_by('pk').first()
+    if config is None:
+        SiteConfiguration.objects.create(**values)
+        return 'created'
+    if not update:
+        return 'skipped'
+    changed = [name for name, value in values.items() if getattr(config, name) != value]
+    if not changed:
+        return 'unchanged'
+    for name in changed:
+        setattr(config, name, values[name])
+    config.save()
+    return 'updated'
+
+
+def sync_seed(data, update=False):
+    """
+    Create the rows in ``data`` (see load_seed()) that the database is
+    missing, in one transaction. Existing rows are skipped so admin edits
+    survive, unless ``update`` is set, in which case they are overwritten with
+    the seed's values. Rows missing from the seed are left alone. Returns a
+    dict of SectionReports, plus ``'site'``: created/updated/unchanged/skipped/None.
+    """
+    now = timezone.now()
+    reports = {'site': None}
+    with transaction.atomic():
+        if data.get('site'):
+            reports['site'] = _sync_site(data['site'], update)
+
+        for section, (model, key) in SEED_MODELS.items():
+            started = time.perf_counter()
+            extra = ('technologies',) if model is Project else ()
+            report, objects, extras = _sync_rows(model, key, data.get(section) or [], now, extra, update)
+            if model is Project:
+                created = {obj.title for obj in report.created}
+                wanted = {
+                    title: _technology_names(values['technologies'])
+                    for title, values in extras.items()
+                    if 'technologies' in values and (update or title in created)
+                }
+                relinked = _sync_technologies(objects, wanted, now)
+                touched = {obj.pk for obj in report.created + report.updated}
+                report.updated += [obj for obj in objects.values() if obj.pk in relinked - touched]
+                report.unchanged -= len(relinked - touched)
+            report.seconds = time.perf_counter() - started
+            reports[section] = report
+
+        _after_bulk_writes(reports)
+    return reports
+
+
+def _after_bulk_writes(reports):
+    projects, skills, posts = (reports[section] for section in SEED_MODELS)
+    if not (projects.changed or skills.changed or posts.changed):
+        return
+    mark_snapshot_stale()
+    groups = set()
+    if projects.changed:
+        groups.add('projects')
+        groups.update('project:%s' % obj.pk for obj in projects.created + projects.updated)
+    if skills.changed:
+        groups.add('skills')
+    if posts.changed:
+        groups.add('blog')
+        groups.update('blogpost:%s' % obj.slug for obj in posts.created + posts.updated)
+    bump_page_groups(*groups)
+    if projects.changed or posts.changed:
+        rebuild_index()
+    for obj in projects.created + projects.updated + posts.created + posts.updated:
+        if needs_renditions(obj):
+            schedule_renditions(obj)
@@ -0,0 +1,118 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_site_configuration, bump_page_groups
+from .images import needs_renditions, schedule_renditions
+from .search import index_project, index_blog_post, remove_from_index
+from .snapshot import SNAPSHOT_MODELS, mark_snapshot_stale
+from .sqlite import apply_pragmas
+from .models import Project, ProjectTechnology, Technology, Skill, BlogPost, SiteConfiguration
+
+
+@receiver(connection_created)
+def tune_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection)
+
+
+def snapshot_changed(sender, **kwargs):
+    mark_snapshot_stale()
+
+
+# Connected ahead of the page cache receivers, so the snapshot is marked
+# stale before any page group is bumped on commit
+for model in SNAPSHOT_MODELS:
+    post_save.connect(snapshot_changed, sender=model, dispatch_uid='snapshot_changed_%s' % model.__name__)
+    post_delete.connect(snapshot_changed, sender=model, dispatch_uid='snapshot_deleted_%s' % model.__name__)
+
+
+@receiver([post_save, post_delete], sender=SiteConfiguration)
+def site_configuration_changed(sender, **kwargs):
+    invalidate_site_configuration()
+    bump_page_groups('site')
+
+
+@receiver([post_save, post_delete], sender=Project)
+def project_changed(sender, instance, **kwargs):
+    bump_page_groups('projects', 'project:%s' % instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    index_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    remove_from_index('project', instance.pk)
+
+
+def touch_projects(project_ids):
+    """
+    Refresh what shows a project's technologies: its ``updated_at`` (which
+    drives ETags and the static export), its pages, the snapshot and its
+    search document. Technology edits don't save the Project row itself.
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+    Project.objects.filter(pk__in=project_ids).update(updated_at=timezone.now())
+    mark_snapshot_stale()
+    bump_page_groups('projects', *('project:%s' % pk for pk in project_ids))
+    for project in Project.objects.filter(pk__in=project_ids).with_technologies():
+        index_project(project)
+
+
+@receiver([post_save, post_delete], sender=ProjectTechnology)
+def project_technology_changed(sender, instance, **kwargs):
+    touch_projects([instance.project_id])
+
+
+@receiver(post_save, sender=Technology)
+def technology_changed(sender, instance, created, **kwargs):
+    if not created:
+        touch_projects(instance.project_links.values_list('project_id', flat=True))
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, **kwargs):
+    bump_page_groups('skills')
+
+
+@receiver(pre_save, sender=BlogPost)
+def blog_post_remember_slug(sender, instance, **kwargs):
+    # A renamed slug must purge the page cached under the old URL as well
+    instance._previous_slug = None
+    if instance.pk:
+        instance._previous_slug = (
+            BlogPost.objects.filter(pk=instance.pk).values_list('slug', flat=True).first()
+        )
+
+
+@receiver([post_save, post_delete], sender=BlogPost)
+def blog_post_changed(sender, instance, **kwargs):
+    groups = {'blog', 'blogpost:%s' % instance.slug}
+    previous_slug = getattr(instance, '_previous_slug', None)
+    if previous_slug:
+        groups.add('blogpost:%s' % previous_slug)
+    bump_page_groups(*groups)
+
+
+@receiver(post_save, sender=BlogPost)
+def blog_post_saved(sender, instance, **kwargs):
+    # Unpublished posts are dropped from the index
+    index_blog_post(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+def blog_post_deleted(sender, instance, **kwargs):
+    remove_from_index('blogpost', instance.pk)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=BlogPost)
+def image_saved(sender, instance, **kwargs):
+    if needs_renditions(instance):
+        schedule_renditions(instance)
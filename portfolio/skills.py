@@ -0,0 +1,79 @@
+"""
+Skills summary shared by the skills and about pages and /skills/summary.json.
+
+One query reads every skill along with its category's count, average and
+maximum proficiency (window aggregates, computed in SQL). The rows are
+grouped in ``Skill.CATEGORY_CHOICES`` order and the result is cached under
+the version of the ``skills`` page group, which the Skill signals bump on
+commit, so it is only rebuilt after a skill changes. A summary read from a
+snapshot older than the last save is returned but not cached.
+"""
+from django.db.models import Avg, Count, F, Max, Window
+
+from .cache import get_page_cache, get_page_versions
+from .models import Skill
+from .snapshot import cache_set_if_current
+
+
+SKILLS_SUMMARY_KEY = 'portfolio:skills-summary:%s'
+
+
+def build_skills_summary(version=None):
+    """The summary as plain, JSON-serialisable data."""
+    partition = {'partition_by': [F('category')]}
+    rows = Skill.objects.annotate(
+        category_count=Window(Count('pk'), **partition),
+        category_average=Window(Avg('proficiency'), **partition),
+        category_max=Window(Max('proficiency'), **partition),
+    ).values(
+        'name', 'category', 'proficiency', 'icon_class',
+        'category_count', 'category_average', 'category_max',
+    )
+    order = {key: position for position, (key, _label) in enumerate(Skill.CATEGORY_CHOICES)}
+    labels = dict(Skill.CATEGORY_CHOICES)
+
+    categories = {}
+    total = 0
+    # Stable sort: within a category the rows keep the model's -proficiency ordering
+    for row in sorted(rows, key=lambda row: order.get(row['category'], len(order))):
+        category = categories.get(row['category'])
+        if category is None:
+            category = categories[row['category']] = {
+                'key': row['category'],
+                'label': labels.get(row['category'], row['category']),
+                'count': row['category_count'],
+                'average': round(row['category_average'], 1),
+                'max': row['category_max'],
+                'skills': [],
+            }
+        category['skills'].append({
+            'name': row['name'],
+            'proficiency': row['proficiency'],
+            'icon_class': row['icon_class'],
+        })
+        total += row['proficiency']
+
+    categories = list(categories.values())
+    count = sum(category['count'] for category in categories)
+    return {
+        'version': version,
+        'count': count,
+        'average': round(total / count, 1) if count else None,
+        'max': max((category['max'] for category in categories), default=None),
+        'categories': categories,
+    }
+
+
+def get_skills_summary():
+    """The cached summary; without a page cache it is built on every call."""
+    cache = get_page_cache()
+    if cache is None:
+        return build_skills_summary()
+    version = get_page_versions(cache, ['skills'])[0]
+    key = SKILLS_SUMMARY_KEY % version
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_skills_summary(version)
+        # No timeout: a skill change moves the version, and so the key
+        cache_set_if_current(cache, key, summary, None)
+    return summary
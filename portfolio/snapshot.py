@@ -0,0 +1,226 @@
+"""
+In-memory read snapshot of the public content tables.
+
+The content behind every public page (projects, skills, blog posts and site
+configuration) is copied out of ``db.sqlite3`` into a shared-cache in-memory
+SQLite database. SnapshotRouter sends the reads of public GET requests
+there, so the hot path never touches the disk file or its locks.
+
+There are two snapshot aliases. A refresh rebuilds the idle one and then
+flips the router to it, so in-flight readers never see a half-copied
+table. Requests are counted as readers of the alias they were given, and
+an alias is only rebuilt once its last reader has finished.
+
+Saves bump a generation number in the cache once they commit. Each process
+reads it at most every PORTFOLIO_SNAPSHOT_POLL_INTERVAL seconds (the saving
+process at once). When the generation has moved, or the copy is older than
+PORTFOLIO_SNAPSHOT_MAX_AGE, a background thread rebuilds the idle alias and
+requests read from disk until it's done; no request waits for a rebuild.
+
+Anything cached from snapshot reads goes through cache_set_if_current(), so
+a request that started before a save can't store what it read under the
+versions that save bumped.
+"""
+import contextvars
+import logging
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+
+from .models import Project, Technology, ProjectTechnology, Skill, BlogPost, SiteConfiguration
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ALIASES = ('snapshot_a', 'snapshot_b')
+SNAPSHOT_MODELS = (Project, Technology, ProjectTechnology, Skill, BlogPost, SiteConfiguration)
+GENERATION_KEY = 'portfolio:snapshot-generation'
+
+# Set for the duration of a public read-only request by SnapshotReadsMiddleware
+snapshot_alias = contextvars.ContextVar('snapshot_alias', default=None)
+
+_state = {'alias': None, 'generation': None, 'loaded_at': 0.0}
+# Last generation read from the cache, and when
+_polled = {'generation': None, 'at': float('-inf')}
+_keepers = {}
+# Held for a whole rebuild, by the thread doing it, so only one runs at a time
+_lock = threading.Lock()
+# Guards _state and the reader counts; never held while copying
+_readers_lock = threading.Lock()
+_readers_drained = threading.Condition(_readers_lock)
+_readers = dict.fromkeys(SNAPSHOT_ALIASES, 0)
+# Generation each alias was last built from
+_generations = dict.fromkeys(SNAPSHOT_ALIASES)
+
+
+def snapshot_enabled():
+    return (
+        getattr(settings, 'PORTFOLIO_SNAPSHOT_READS', False)
+        and all(alias in settings.DATABASES for alias in SNAPSHOT_ALIASES)
+        # Nothing to copy from in tests, where the default database is in memory too
+        and not connections['default'].is_in_memory_db()
+    )
+
+
+def _cache():
+    return caches[getattr(settings, 'PORTFOLIO_SNAPSHOT_CACHE', 'default')]
+
+
+def mark_snapshot_stale():
+    """Make every process rebuild its snapshot once the current transaction commits."""
+    if not snapshot_enabled():
+        return
+
+    def bump():
+        _cache().set(GENERATION_KEY, time.time_ns(), None)
+        # This process needn't wait for its next poll
+        _polled['at'] = float('-inf')
+
+    transaction.on_commit(bump)
+
+
+def _keeper(alias):
+    # The in-memory database lives only as long as some connection holds it open
+    if alias not in _keepers:
+        _keepers[alias] = sqlite3.connect(
+            settings.DATABASES[alias]['NAME'], uri=True, check_same_thread=False,
+            isolation_level=None,
+        )
+    return _keepers[alias]
+
+
+def _copy_tables(target):
+    source = str(settings.DATABASES['default']['NAME'])
+    tables = [model._meta.db_table for model in SNAPSHOT_MODELS]
+    target.execute('ATTACH DATABASE ? AS disk', ['file:%s?mode=ro' % source])
+    try:
+        target.execute('BEGIN')
+        for table in tables:
+            schema = target.execute(
+                "SELECT type, name, sql FROM disk.sqlite_master "
+                "WHERE tbl_name = ? AND sql IS NOT NULL ORDER BY type DESC",
+                [table],
+            ).fetchall()
+            current = target.execute(
+                "SELECT type, name, sql FROM main.sqlite_master "
+                "WHERE tbl_name = ? AND sql IS NOT NULL ORDER BY type DESC",
+                [table],
+            ).fetchall()
+            if schema != current:
+                # First load, or a migration changed the table since the last one
+                target.execute('DROP TABLE IF EXISTS main."%s"' % table)
+                for _type, _name, sql in schema:
+                    target.execute(sql)
+            else:
+                target.execute('DELETE FROM main."%s"' % table)
+            target.execute('INSERT INTO main."%s" SELECT * FROM disk."%s"' % (table, table))
+        target.execute('COMMIT')
+    except Exception:
+        if target.in_transaction:
+            target.execute('ROLLBACK')
+        raise
+    finally:
+        target.execute('DETACH DATABASE disk')
+
+
+def _read_generation():
+    cache = _cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _current_generation():
+    now = time.monotonic()
+    if now - _polled['at'] >= getattr(settings, 'PORTFOLIO_SNAPSHOT_POLL_INTERVAL', 1):
+        _polled.update(generation=_read_generation(), at=now)
+    return _polled['generation']
+
+
+def _join_current(generation, max_age):
+    # Count the request as a reader of the current alias if it's fresh
+    with _readers_lock:
+        alias = _state['alias']
+        if (
+            alias is None
+            or _state['generation'] != generation
+            or time.monotonic() - _state['loaded_at'] >= max_age
+        ):
+            return None
+        _readers[alias] += 1
+        return alias
+
+
+def _rebuild(generation):
+    # Runs in its own thread, holding _lock (taken by acquire_snapshot)
+    try:
+        with _readers_lock:
+            target = SNAPSHOT_ALIASES[1] if _state['alias'] == SNAPSHOT_ALIASES[0] else SNAPSHOT_ALIASES[0]
+            # Requests from before the last flip may still read it; rebuilding
+            # under them would fail with SQLITE_LOCKED
+            if not _readers_drained.wait_for(lambda: not _readers[target], timeout=5):
+                return
+        try:
+            _copy_tables(_keeper(target))
+        except sqlite3.Error:
+            logger.exception('Failed to refresh the read snapshot; reading from disk')
+            with _readers_lock:
+                _state['alias'] = None
+            return
+        with _readers_lock:
+            _generations[target] = generation
+            _state.update(alias=target, generation=generation, loaded_at=time.monotonic())
+    finally:
+        _lock.release()
+
+
+def acquire_snapshot():
+    """
+    Return the alias holding an up-to-date snapshot, or None if reads should
+    go to the default database, starting a rebuild in the background if the
+    snapshot is stale. The request counts as a reader of the alias until
+    release_snapshot().
+    """
+    if not snapshot_enabled():
+        return None
+    generation = _current_generation()
+    alias = _join_current(generation, getattr(settings, 'PORTFOLIO_SNAPSHOT_MAX_AGE', 60))
+    if alias is None and _lock.acquire(blocking=False):
+        threading.Thread(target=_rebuild, args=(generation,), name='snapshot-rebuild', daemon=True).start()
+    return alias
+
+
+def release_snapshot(alias):
+    with _readers_lock:
+        _readers[alias] -= 1
+        if not _readers[alias]:
+            _readers_drained.notify_all()
+
+
+def snapshot_outdated():
+    """
+    Whether the current request reads a snapshot older than the last
+    committed save. Pages rendered from it must not be cached under group
+    versions bumped by that save.
+    """
+    alias = snapshot_alias.get()
+    return alias is not None and _generations[alias] != _cache().get(GENERATION_KEY)
+
+
+def cache_set_if_current(cache, key, value, timeout):
+    """
+    ``cache.set()`` for anything built from reads the router may have sent to
+    the snapshot. Skipped, returning False, when the request's snapshot
+    predates the last committed save, which may already have moved the
+    versions in ``key``.
+    """
+    if snapshot_outdated():
+        return False
+    cache.set(key, value, timeout)
+    return True
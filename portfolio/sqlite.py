@@ -0,0 +1,38 @@
+import re
+
+from django.conf import settings
+
+
+# Applied to every new SQLite connection; override with PORTFOLIO_SQLITE_PRAGMAS.
+DEFAULT_PRAGMAS = {
+    # Readers no longer block on a writer (and vice versa)
+    'journal_mode': 'wal',
+    # Durable at checkpoint rather than every commit; safe with WAL
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative means KiB: 64 MiB of page cache per connection
+    'cache_size': -64 * 1024,
+    # Wait for the write lock instead of raising "database is locked"
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+    'foreign_keys': 'on',
+}
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+def get_pragmas():
+    return getattr(settings, 'PORTFOLIO_SQLITE_PRAGMAS', DEFAULT_PRAGMAS)
+
+
+def apply_pragmas(dbapi_connection, pragmas=None):
+    """Run ``PRAGMA name = value`` for each setting on a raw sqlite3 connection."""
+    pragmas = get_pragmas() if pragmas is None else pragmas
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not _PRAGMA_NAME.match(name):
+                raise ValueError('Invalid SQLite pragma name: %r' % name)
+            cursor.execute('PRAGMA %s = %s' % (name, value))
+    finally:
+        cursor.close()
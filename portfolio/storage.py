@@ -0,0 +1,40 @@
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+from .compression import compress_file
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes ``.gz``/``.br`` siblings of every
+    collected file for PrecompressedMiddleware (or a front-end server) to
+    serve.
+
+    Until collectstatic has written a manifest (development, tests) names
+    are served unhashed. Once it has, only a reference to a file that doesn't
+    exist at all (say a template's missing image) keeps its name, and is
+    logged; it can only 404. An existing file missing from the manifest means
+    collectstatic is out of date, and fails as with Django's storage.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            if self.exists(self.clean_name(name)):
+                raise
+            logger.warning('Static file %r does not exist', name)
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(paths) | set(self.hashed_files.values())):
+            compress_file(self.path(name))
@@ -0,0 +1,78 @@
+from pathlib import PurePosixPath
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..bundles import bundle_exists, plan_bundles
+
+
+register = template.Library()
+
+
+class BundleNode(template.Node):
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    @property
+    def stem(self):
+        origin = getattr(self, 'origin', None)
+        return PurePosixPath(origin.template_name).stem if origin and origin.template_name else 'bundle'
+
+    def render(self, context):
+        body = self.nodelist.render(context)
+        # Nodes are shared by every thread through the cached loader, so any
+        # per-render state lives in render_context
+        last = context.render_context.get(self)
+        if last is not None and last[0] == body:
+            return last[1]
+        css, js, rest = plan_bundles(self.stem, body)
+        parts = []
+        if css:
+            if bundle_exists(css[0]):
+                parts.append(format_html('<link rel="stylesheet" href="{}{}">', settings.STATIC_URL, css[0]))
+            else:
+                # Not built yet (manage.py build_bundles)
+                parts.append('<style>%s</style>' % css[1])
+        if rest:
+            parts.append(rest)
+        if js:
+            if bundle_exists(js[0]):
+                parts.append(format_html('<script src="{}{}"></script>', settings.STATIC_URL, js[0]))
+            else:
+                parts.append('<script>\n%s\n</script>' % js[1])
+        output = mark_safe('\n'.join(parts))
+        context.render_context[self] = (body, output)
+        return output
+
+
+@register.tag
+def bundle(parser, token):
+    """
+    Move the inline ``<style>``/``<script>`` elements inside the tag into
+    content-hashed static files and link to them instead (see bundles.py).
+
+        {% bundle %}<style>...</style>{% endbundle %}
+    """
+    if len(token.split_contents()) != 1:
+        raise template.TemplateSyntaxError("'bundle' takes no arguments")
+    nodelist = parser.parse(('endbundle',))
+    parser.delete_first_token()
+    return BundleNode(nodelist)
+
+
+@register.simple_tag
+def vendor_static(path):
+    """
+    URL of a self-hosted vendor file (see vendor.py), or '' until
+    ``manage.py vendor_assets`` has written it, so the caller can fall back
+    to the CDN.
+
+        {% vendor_static 'vendor/vendor.css' as vendor_css %}
+    """
+    if not finders.find(path):
+        return ''
+    return static(path)
@@ -0,0 +1,62 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+
+from ..cache import deploy_version, get_page_cache, get_page_versions
+from ..snapshot import cache_set_if_current
+
+
+register = template.Library()
+
+FRAGMENT_KEY = 'portfolio:fragment:%s'
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, vary_on, groups):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.groups = groups
+
+    def render(self, context):
+        cache = get_page_cache()
+        if cache is None:
+            return self.nodelist.render(context)
+        groups = [group.strip() for group in str(self.groups.resolve(context)).split(',') if group.strip()]
+        parts = [self.name.resolve(context), deploy_version()]
+        parts += [str(var.resolve(context)) for var in self.vary_on]
+        parts += [str(version) for version in get_page_versions(cache, groups)]
+        key = FRAGMENT_KEY % hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.nodelist.render(context)
+            cache_set_if_current(
+                cache, key, fragment, getattr(settings, 'PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24),
+            )
+        return fragment
+
+
+@register.tag
+def cache_fragment(parser, token):
+    """
+    Cache the enclosed fragment until one of the page cache ``groups`` it is
+    built from changes (the same versions that expire whole pages, see
+    cache.py), e.g. while a page-level miss re-renders the rest:
+
+        {% cache_fragment 'home-project-cards' groups='projects' %}...{% endcache_fragment %}
+        {% cache_fragment 'project-tech' project.pk groups='projects' %}...{% endcache_fragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3 or not bits[-1].startswith('groups='):
+        raise template.TemplateSyntaxError(
+            "'%s' takes a fragment name, optional vary-on values and groups='...'" % bits[0]
+        )
+    nodelist = parser.parse(('endcache_fragment',))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:-1]],
+        parser.compile_filter(bits[-1][len('groups='):]),
+    )
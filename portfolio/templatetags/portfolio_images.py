@@ -0,0 +1,62 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+
+from ..images import MIME_TYPES
+
+
+register = template.Library()
+
+
+def _srcset(entries):
+    return ', '.join('%s %sw' % (default_storage.url(name), width) for width, _height, name in entries)
+
+
+@register.simple_tag
+def responsive_image(obj, sizes='100vw', alt='', css_class='', loading='lazy'):
+    """
+    Render ``obj.image`` as a ``<picture>`` with AVIF/WebP/JPEG srcsets from
+    ``obj.image_renditions``, plus width/height so the layout doesn't shift.
+    Falls back to a plain ``<img>`` of the original until renditions exist.
+
+        {% responsive_image project sizes="(max-width: 768px) 100vw, 50vw" alt=project.title %}
+    """
+    if not obj.image:
+        return ''
+    renditions = obj.image_renditions or {}
+    formats = renditions.get('formats') if renditions.get('source') == obj.image.name else None
+    if not formats:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" decoding="async">',
+            obj.image.url, alt, css_class, loading,
+        )
+
+    fallback_format = 'jpeg' if 'jpeg' in formats else list(formats)[-1]
+    fallback = formats[fallback_format]
+    # The fallback src is the rendition closest to 1280px wide
+    _src_width, _src_height, src_name = min(fallback, key=lambda entry: abs(entry[0] - 1280))
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(entries), sizes) for fmt, entries in formats.items() if fmt != fallback_format),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" decoding="async"></picture>',
+        sources, default_storage.url(src_name), _srcset(fallback), sizes,
+        renditions['width'], renditions['height'], alt, css_class, loading,
+    )
+
+
+@register.simple_tag
+def thumbnail_url(source, width, height=0):
+    """
+    URL of an on-demand thumbnail of an image field or a ``static/images/...``
+    path, cropped to ``width`` x ``height`` (0 keeps the aspect ratio).
+
+        <img src="{% thumbnail_url project.image 600 400 %}">
+    """
+    path = getattr(source, 'name', source)
+    if not path:
+        return ''
+    return reverse('portfolio:thumbnail', kwargs={'width': width, 'height': height, 'path': path})
@@ -1,3 +1,694 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.admin.models import CHANGE, LogEntry
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.mail import EmailMessage
+from django.db import connection
+from django.http import Http404
+from django.template import Context, Template
+from django.test import (
+    AsyncRequestFactory, SimpleTestCase, TestCase, RequestFactory, override_settings, skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import async_views, signals, views
+from .archive import _MonthWriter, archive_contacts, read_archive
+from .bundles import minify_css, minify_js
+from .cache import _local_config, bump_page_groups, get_site_configuration
+from .ingest import _lock_segment, replay_journal
+from .search import SEARCH_TABLE, search
+from .models import Project, Skill, BlogPost, Contact, OutboxMessage, SiteConfiguration
+from .outbox import drain_outbox, retry_delay
+from .seed import DEFAULT_SEED, load_seed
+from .transfer import Importer, export_records
+from .views import ProjectsView, BlogListView
+
+
+@skipUnlessDBFeature('supports_explaining_query_execution')
+class ListingQueryPlanTests(TestCase):
+    """The listing querysets behind the public views must be served by an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(20):
+            Project.objects.create(
+                title=f'Project {i}', description='...', short_description='...',
+                category='web' if i % 2 else 'ai', featured=i % 5 == 0,
+            )
+            Skill.objects.create(name=f'Skill {i}', category='backend', proficiency=i)
+            BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', content='...', excerpt='...',
+                published=i % 3 != 0,
+            )
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        if connection.vendor == 'sqlite':
+            # The index must provide the ordering, not just the filter
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def view_queryset(self, view_class, **params):
+        view = view_class()
+        view.setup(RequestFactory().get('/', params))
+        return view.get_queryset()
+
+    def test_projects_view(self):
+        self.assertUsesIndex(self.view_queryset(ProjectsView), 'project_featured_created_idx')
+
+    def test_projects_view_category(self):
+        self.assertUsesIndex(
+            self.view_queryset(ProjectsView, category='web'), 'project_category_idx'
+        )
+
+    def test_home_featured_projects(self):
+        self.assertUsesIndex(
+            Project.objects.filter(featured=True)[:3], 'project_featured_created_idx'
+        )
+
+    def test_blog_list_view(self):
+        self.assertUsesIndex(self.view_queryset(BlogListView), 'blogpost_published_idx')
+
+    def test_skills_view(self):
+        self.assertUsesIndex(Skill.objects.all(), 'skill_category_idx')
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=None)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.create(title='Project', description='...', short_description='...', category='web')
+
+    def test_not_modified_repeats_validators(self):
+        response = self.client.get(reverse('portfolio:projects'))
+        self.assertEqual(response.status_code, 200)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        response = self.client.get(reverse('portfolio:projects'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Last-Modified'], last_modified)
+
+    def test_deploy_changes_etag(self):
+        etag = self.client.get(reverse('portfolio:projects'))['ETag']
+        with mock.patch('portfolio.cache.deploy_version', return_value='next-deploy'):
+            response = self.client.get(reverse('portfolio:projects'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_differs_for_authenticated_users(self):
+        anonymous = self.client.get(reverse('portfolio:projects'))['ETag']
+        self.client.force_login(User.objects.create_user('staff'))
+        response = self.client.get(reverse('portfolio:projects'), headers={'if-none-match': anonymous})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], anonymous)
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=None)
+class ProjectsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        web = Project.objects.create(title='Django site', description='...', short_description='...', category='web')
+        web.set_technologies(['Django', 'Python'])
+        game = Project.objects.create(title='Space game', description='...', short_description='...', category='game')
+        game.set_technologies(['Godot'])
+
+    def test_renders_projects(self):
+        response = self.client.get(reverse('portfolio:projects'))
+        self.assertContains(response, 'Django site')
+        self.assertContains(response, 'Space game')
+        self.assertContains(response, '?tech=Godot')
+
+    def test_filters(self):
+        response = self.client.get(reverse('portfolio:projects'), {'tech': 'Godot'})
+        self.assertContains(response, 'Space game')
+        self.assertNotContains(response, 'Django site')
+        response = self.client.get(reverse('portfolio:projects'), {'category': 'web'})
+        self.assertContains(response, 'Django site')
+        self.assertNotContains(response, 'Space game')
+
+    def test_paginates(self):
+        Project.objects.bulk_create(
+            Project(title='Extra %d' % i, description='...', short_description='...') for i in range(9)
+        )
+        response = self.client.get(reverse('portfolio:projects'), {'tech': 'Python'})
+        self.assertNotContains(response, 'page=2')
+        response = self.client.get(reverse('portfolio:projects'))
+        self.assertEqual(len(response.context['projects']), 9)
+        self.assertContains(response, '?page=2')
+        self.assertContains(self.client.get(reverse('portfolio:projects'), {'page': 2}), '?page=1')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PORTFOLIO_PAGE_CACHE=None,
+    PORTFOLIO_OUTBOX_SEND_ON_SUBMIT=False,
+)
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteConfiguration.objects.create(about_text='...', email='owner@example.com')
+        cls.project = Project.objects.create(
+            title='Django site', description='...', short_description='...', featured=True,
+        )
+        cls.project.set_technologies(['Django'])
+        cls.post = BlogPost.objects.create(
+            title='First post', slug='first-post', content='...', excerpt='...', published=True,
+        )
+
+    def setUp(self):
+        _local_config.clear()
+        caches['default'].clear()
+
+    def prepare(self, request):
+        user = AnonymousUser()
+        request.user = user
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        request._messages = CookieStorage(request)
+        return request
+
+    async def render(self, view, path, **kwargs):
+        response = await view.as_view()(self.prepare(AsyncRequestFactory().get(path)), **kwargs)
+        # As the handler does, off the event loop
+        return await sync_to_async(response.render)()
+
+    async def test_pages_match_the_sync_views(self):
+        pages = [
+            (async_views.AsyncHomeView, views.HomeView, reverse('portfolio:home'), {}),
+            (async_views.AsyncProjectsView, views.ProjectsView, reverse('portfolio:projects'), {}),
+            (async_views.AsyncProjectDetailView, views.ProjectDetailView,
+             reverse('portfolio:project_detail', args=[self.project.pk]), {'pk': self.project.pk}),
+            (async_views.AsyncBlogListView, views.BlogListView, reverse('portfolio:blog_list'), {}),
+            (async_views.AsyncBlogDetailView, views.BlogDetailView,
+             reverse('portfolio:blog_detail', args=[self.post.slug]), {'slug': self.post.slug}),
+        ]
+        for async_view, sync_view, path, kwargs in pages:
+            with self.subTest(path=path):
+                response = await self.render(async_view, path, **kwargs)
+                expected = await sync_to_async(
+                    lambda: sync_view.as_view()(self.prepare(RequestFactory().get(path)), **kwargs).render()
+                )()
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+
+    async def test_missing_object_is_404(self):
+        with self.assertRaises(Http404):
+            await self.render(async_views.AsyncProjectDetailView, '/projects/0/', pk=0)
+
+    async def test_contact_post_saves_and_queues_notification(self):
+        request = self.prepare(AsyncRequestFactory().post(
+            reverse('portfolio:contact'),
+            {'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hi', 'message': 'Hello there'},
+            headers={'x-requested-with': 'XMLHttpRequest'},
+        ))
+        response = await async_views.AsyncContactView.as_view()(request)
+        self.assertEqual(json.loads(response.content), {'success': True, 'message': 'Message sent successfully!'})
+        contact = await Contact.objects.aget()
+        self.assertEqual(contact.subject, 'Hi')
+        self.assertEqual(
+            [message.recipients async for message in OutboxMessage.objects.all()], [['owner@example.com']],
+        )
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PORTFOLIO_PAGE_CACHE='default',
+)
+class FragmentCacheTests(TestCase):
+    template = Template(
+        "{% load portfolio_cache %}{% cache_fragment 'greeting' groups='site' %}{{ name }}{% endcache_fragment %}"
+    )
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def render(self, name):
+        return self.template.render(Context({'name': name}))
+
+    def test_cached_until_its_group_changes(self):
+        self.assertEqual(self.render('Ada'), 'Ada')
+        self.assertEqual(self.render('Grace'), 'Ada')
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_page_groups('site')
+        self.assertEqual(self.render('Grace'), 'Grace')
+
+    def test_outdated_snapshot_is_not_cached(self):
+        with mock.patch('portfolio.snapshot.snapshot_outdated', return_value=True):
+            self.assertEqual(self.render('Ada'), 'Ada')
+        self.assertEqual(self.render('Grace'), 'Grace')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PORTFOLIO_PAGE_CACHE='default',
+)
+class SkillsSummaryTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        Skill.objects.create(name='Python', category='backend', proficiency=90)
+
+    def test_outdated_snapshot_is_neither_cached_nor_immutable(self):
+        url = reverse('portfolio:skills_summary')
+        with mock.patch('portfolio.snapshot.snapshot_outdated', return_value=True), \
+                mock.patch('portfolio.views.snapshot_outdated', return_value=True):
+            version = self.client.get(url).json()['version']
+            response = self.client.get(url, {'v': version})
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0, must-revalidate')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'v': version})
+        self.assertTrue(queries)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        with self.assertNumQueries(0):
+            self.client.get(url, {'v': version})
+
+
+class SearchIndexTests(TestCase):
+    def indexed(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT kind, object_id, title FROM %s' % SEARCH_TABLE)
+            return {(kind, int(object_id)): title for kind, object_id, title in cursor.fetchall()}
+
+    def test_blog_post_follows_saves_unpublish_and_delete(self):
+        post = BlogPost.objects.create(
+            title='Keyset pagination', slug='keyset', content='...', excerpt='...', published=True,
+        )
+        self.assertEqual(self.indexed(), {('blogpost', post.pk): 'Keyset pagination'})
+
+        post.title = 'Cursor pagination'
+        post.save()
+        self.assertEqual([result.object for result in search('cursor')], [post])
+        self.assertEqual(search('keyset'), [])
+
+        post.published = False
+        post.save()
+        self.assertEqual(self.indexed(), {})
+
+        post.published = True
+        post.save()
+        post.delete()
+        self.assertEqual(self.indexed(), {})
+
+    def test_project_follows_technology_changes(self):
+        project = Project.objects.create(title='Site', description='...', short_description='...')
+        project.set_technologies(['Django'])
+        self.assertEqual([result.object for result in search('django')], [project])
+        project.set_technologies(['Flask'])
+        self.assertEqual(search('django'), [])
+        self.assertEqual([result.object for result in search('flask')], [project])
+        project.delete()
+        self.assertEqual(self.indexed(), {})
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PORTFOLIO_CONFIG_CACHE='default',
+)
+class SiteConfigurationCacheTests(TestCase):
+    def setUp(self):
+        _local_config.clear()
+        caches['default'].clear()
+        self.config = SiteConfiguration.objects.create(about_text='...', email='ada@example.com')
+
+    def test_invalidated_once_the_save_commits(self):
+        self.assertEqual(get_site_configuration().site_title, 'Portfolio')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.site_title = 'Renamed'
+            self.config.save()
+            # Not committed yet, so the cached row still stands
+            self.assertEqual(get_site_configuration().site_title, 'Portfolio')
+        self.assertEqual(get_site_configuration().site_title, 'Renamed')
+
+    def test_outdated_snapshot_is_not_cached(self):
+        with mock.patch('portfolio.cache.snapshot_outdated', return_value=True):
+            get_site_configuration()
+        self.assertEqual(_local_config, {})
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PORTFOLIO_PAGE_CACHE='default',
+)
+class PageCacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.post = BlogPost.objects.create(
+            title='First post', slug='first-post', content='...', excerpt='...', published=True,
+        )
+        self.url = reverse('portfolio:blog_detail', args=[self.post.slug])
+
+    def test_hit_serves_the_cached_page(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.content, first.content)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, headers={'if-none-match': first['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], first['ETag'])
+
+    def test_save_invalidates_the_page(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = 'Renamed post'
+            self.post.save()
+        self.assertContains(self.client.get(self.url), 'Renamed post')
+
+    def test_authenticated_pages_are_not_cached(self):
+        self.client.force_login(User.objects.create_user('staff'))
+        with mock.patch.object(caches['default'], 'set') as cache_set:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        cache_set.assert_not_called()
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    PORTFOLIO_OUTBOX_RETRY_DELAY=30,
+    PORTFOLIO_OUTBOX_MAX_RETRY_DELAY=100,
+    PORTFOLIO_OUTBOX_MAX_ATTEMPTS=3,
+)
+class OutboxRetryTests(TestCase):
+    def setUp(self):
+        self.message = OutboxMessage.objects.create(
+            subject='Hi', body='...', from_email='site@example.com', recipients=['ada@example.com'],
+        )
+
+    def make_due(self):
+        OutboxMessage.objects.filter(pk=self.message.pk).update(next_attempt_at=timezone.now())
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        self.assertEqual([retry_delay(n).total_seconds() for n in range(1, 5)], [30, 60, 100, 100])
+
+    def test_failures_back_off_until_max_attempts(self):
+        with mock.patch.object(EmailMessage, 'send', side_effect=OSError('connection refused')):
+            for attempts, delay in [(1, 30), (2, 60)]:
+                before = timezone.now()
+                self.assertEqual(drain_outbox(), (0, 1))
+                self.message.refresh_from_db()
+                self.assertEqual((self.message.status, self.message.attempts), ('pending', attempts))
+                self.assertGreaterEqual(self.message.next_attempt_at, before + timedelta(seconds=delay))
+                # Not due again until the delay has passed
+                self.assertEqual(drain_outbox(), (0, 0))
+                self.make_due()
+            self.assertEqual(drain_outbox(), (0, 1))
+
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts), ('failed', 3))
+        self.assertEqual(self.message.last_error, 'OSError: connection refused')
+        self.make_due()
+        self.assertEqual(drain_outbox(), (0, 0))
+
+    def test_sent_on_retry(self):
+        with mock.patch.object(EmailMessage, 'send', side_effect=OSError('connection refused')):
+            drain_outbox()
+        self.make_due()
+        self.assertEqual(drain_outbox(), (1, 0))
+        self.message.refresh_from_db()
+        self.assertEqual((self.message.status, self.message.attempts, self.message.last_error), ('sent', 2, ''))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class MinifierTests(SimpleTestCase):
+    def test_js_drops_comments_indentation_and_blank_lines(self):
+        js = '// setup\nif (ready) {\n    start(); // go\n\n    /* later\n       maybe */\n    stop();\n}\n'
+        self.assertEqual(minify_js(js), 'if (ready) {\nstart();\nstop();\n}')
+
+    def test_js_keeps_literals_intact(self):
+        for js in [
+            'const html = `\n    <p>\n    // not a comment\n    ${items.map(i => `<b>${i}</b>`).join(\'\')}\n`;',
+            "const url = 'https://example.com/*path*/'; const sep = \"//\";",
+            "const s = 'first \\\n    // still the string';",
+            "const re = /\\/\\/[/*]'/g;",
+        ]:
+            with self.subTest(js=js):
+                self.assertEqual(minify_js(js), js)
+
+    def test_js_tells_division_from_regex(self):
+        self.assertEqual(minify_js('total = a / b / c; // ratio'), 'total = a / b / c;')
+        self.assertEqual(minify_js('return /^#/.test(hash); // anchor'), 'return /^#/.test(hash);')
+
+    def test_css_keeps_strings(self):
+        css = 'a::after {\n    content: "/* not a comment */";  /* comment */\n    color: red;\n}'
+        self.assertEqual(minify_css(css), 'a::after{content:"/* not a comment */";color:red}')
+
+
+class ContactJournalTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(PORTFOLIO_CONTACT_JOURNAL_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def journal_line(self, **payload):
+        payload = {
+            'id': str(uuid.uuid4()), 'created_at': timezone.now().isoformat(),
+            'name': 'Ada', 'email': 'ada@example.com', 'subject': 'Hi', 'message': '...',
+            **payload,
+        }
+        return json.dumps(payload) + '\n'
+
+    def test_replay_is_idempotent(self):
+        line = self.journal_line()
+        # Journaled twice, e.g. by a batch that was retried
+        (self.directory / 'a-00000000.ndjson').write_text(line)
+        (self.directory / 'a-00000001.ndjson').write_text(line)
+        self.assertEqual(replay_journal(), (2, 1))
+        (self.directory / 'a-00000002.ndjson').write_text(line)
+        self.assertEqual(replay_journal(), (1, 0))
+        self.assertEqual(Contact.objects.filter(ingest_id=json.loads(line)['id']).count(), 1)
+
+    def test_replays_leftover_segment_named_after_this_pid(self):
+        # Left by a crashed worker whose PID this process reused
+        (self.directory / f'{os.getpid()}-00000000.ndjson').write_text(self.journal_line())
+        self.assertEqual(replay_journal(), (1, 1))
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_skips_segments_a_live_ingestor_holds(self):
+        path = self.directory / 'live-00000000.ndjson'
+        with open(path, 'x') as segment:
+            self.assertTrue(_lock_segment(segment))
+            segment.write(self.journal_line())
+            segment.flush()
+            self.assertEqual(replay_journal(), (0, 0))
+            self.assertEqual(replay_journal(owner='live', include_live=True), (0, 0))
+            self.assertTrue(path.exists())
+        self.assertEqual(replay_journal(), (1, 1))
+
+
+class ContactArchiveTests(TestCase):
+    def contact(self, **kwargs):
+        return Contact.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='...', **kwargs)
+
+    def test_messages_marked_unread_after_archiving_are_kept(self):
+        old = timezone.now() - timedelta(days=400)
+        archived = self.contact(created_at=old, read=True)
+        reopened = self.contact(created_at=old, read=True)
+        unread = self.contact(created_at=old, read=False)
+        recent = self.contact(read=True)
+        commit = _MonthWriter.commit
+
+        def commit_then_reopen(writer):
+            commit(writer)
+            # Marked unread in the admin between the archive write and the delete
+            Contact.objects.filter(pk=reopened.pk).update(read=False)
+
+        month = timezone.localtime(old).strftime('%Y-%m')
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(PORTFOLIO_CONTACT_ARCHIVE_DIR=directory), \
+                mock.patch.object(_MonthWriter, 'commit', commit_then_reopen):
+            self.assertEqual(archive_contacts(days=180), {month: 2})
+            self.assertEqual({record['pk'] for record in read_archive(month)}, {archived.pk, reopened.pk})
+        self.assertEqual(
+            set(Contact.objects.values_list('pk', flat=True)), {reopened.pk, unread.pk, recent.pk}
+        )
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=None, PORTFOLIO_CURSOR_PAGINATION=True)
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.posts = [
+            BlogPost.objects.create(
+                title=f'Post {i}', slug=f'post-{i}', content='...', excerpt='...',
+                published=True, created_at=now - timedelta(hours=i),
+            )
+            for i in range(8)
+        ]
+
+    def page(self, **params):
+        return self.client.get(reverse('portfolio:blog_list'), params).context['page_obj']
+
+    def test_next_and_previous(self):
+        first = self.page()
+        self.assertEqual(list(first), self.posts[:6])
+        self.assertFalse(first.has_previous())
+
+        second = self.page(cursor=first.next_cursor)
+        self.assertEqual(list(second), self.posts[6:])
+        self.assertFalse(second.has_next())
+
+        self.assertEqual(list(self.page(cursor=second.previous_cursor)), self.posts[:6])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse('portfolio:blog_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class RangeRequestTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.content = bytes(range(100))
+        Path(directory.name, 'sample.bin').write_bytes(self.content)
+        media_root = override_settings(MEDIA_ROOT=directory.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.url = '/media/sample.bin'
+
+    def get(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        self.addCleanup(response.close)
+        return response
+
+    def test_partial_content(self):
+        response = self.get(range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response.getvalue(), self.content[10:20])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range='bytes=200-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_if_range(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(range='bytes=0-9', if_range=etag).status_code, 206)
+        # The client's copy is outdated, so it gets the whole file
+        response = self.get(range='bytes=0-9', if_range='"outdated"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.getvalue(), self.content)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ContentTransferTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Ledger', description='...', short_description='...')
+        self.project.set_technologies(['Django', 'Oracle', 'Docker'])
+
+    def technologies(self):
+        return list(self.project.technology_links.order_by('position').values_list('technology__name', flat=True))
+
+    def test_set_technologies_refreshes_the_project_once(self):
+        before = Project.objects.get(pk=self.project.pk).updated_at
+        with mock.patch('portfolio.signals.touch_projects', wraps=signals.touch_projects) as touch:
+            self.project.set_technologies(['Python', 'Django'])
+        touch.assert_called_once_with([self.project.pk])
+        self.assertEqual(self.technologies(), ['Python', 'Django'])
+        self.assertGreater(Project.objects.get(pk=self.project.pk).updated_at, before)
+
+    def test_import_relinks_without_per_link_signals(self):
+        record = next(export_records(['project']))
+        record['technologies'] = ['Grails', 'Groovy']
+        importer = Importer(update=True)
+        with mock.patch('portfolio.signals.touch_projects') as touch:
+            importer.add(record)
+            importer.finish()
+        touch.assert_not_called()
+        self.assertEqual(importer.updated['project'], 1)
+        self.assertEqual(self.technologies(), ['Grails', 'Groovy'])
+
+    def test_export_import_round_trip(self):
+        Skill.objects.create(name='Python', category='backend', proficiency=90)
+        BlogPost.objects.create(title='First post', slug='first-post', content='...', excerpt='...', published=True)
+        Contact.objects.create(name='Ada', email='ada@example.com', subject='Hi', message='...')
+        path = Path(tempfile.mkdtemp()) / 'content.ndjson'
+        self.addCleanup(shutil.rmtree, path.parent)
+        call_command('export_content', str(path), stdout=io.StringIO(), stderr=io.StringIO())
+        exported = path.read_text(encoding='utf-8')
+
+        for model in (Contact, BlogPost, Project, Skill):
+            model.objects.all().delete()
+        call_command('import_content', str(path), stdout=io.StringIO())
+        call_command('export_content', str(path), stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(path.read_text(encoding='utf-8'), exported)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PopulatePortfolioTests(TestCase):
+    def populate(self, *args):
+        call_command('populate_portfolio', *args, stdout=io.StringIO())
+
+    def test_rerun_keeps_admin_edits_unless_updating(self):
+        self.populate()
+        seed = load_seed(DEFAULT_SEED)
+        self.assertEqual(SiteConfiguration.objects.get().about_text, seed['site']['about_text'])
+        self.assertEqual(Project.objects.count(), len(seed['projects']))
+        project = Project.objects.get(title=seed['projects'][0]['title'])
+        project.description = 'Edited in the admin'
+        project.save()
+        project.technologies.clear()
+        SiteConfiguration.objects.update(site_title='Edited')
+
+        self.populate()
+        project.refresh_from_db()
+        self.assertEqual(project.description, 'Edited in the admin')
+        self.assertFalse(project.technologies.exists())
+        self.assertEqual(SiteConfiguration.objects.get().site_title, 'Edited')
+
+        self.populate('--update')
+        project.refresh_from_db()
+        self.assertEqual(project.description, seed['projects'][0]['description'])
+        self.assertTrue(project.technologies.exists())
+        self.assertEqual(SiteConfiguration.objects.get().site_title, seed['site']['site_title'])
+
+
+class ChangeListBulkEditTests(TestCase):
+    def test_list_editable_save_is_one_update(self):
+        contacts = [
+            Contact.objects.create(name=f'Ada {i}', email='ada@example.com', subject='Hi', message='...')
+            for i in range(3)
+        ]
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        data = {
+            'form-TOTAL_FORMS': '3', 'form-INITIAL_FORMS': '3',
+            'form-MIN_NUM_FORMS': '0', 'form-MAX_NUM_FORMS': '1000', '_save': 'Save',
+        }
+        for i, contact in enumerate(contacts):
+            data[f'form-{i}-id'] = str(contact.pk)
+            data[f'form-{i}-read'] = 'on'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('admin:portfolio_contact_changelist'), data)
+        self.assertEqual(response.status_code, 302)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE "portfolio_contact"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Contact.objects.filter(read=True).count(), 3)
+        self.assertEqual(
+            set(LogEntry.objects.filter(action_flag=CHANGE).values_list('object_id', flat=True)),
+            {str(contact.pk) for contact in contacts},
+        )
@@ -0,0 +1,249 @@
+"""
+On-demand thumbnails for ``/media/thumb/<w>x<h>/<path>``.
+
+``path`` is either an uploaded image under one of the Project/BlogPost
+``upload_to`` directories, or ``static/images/...``. A thumbnail is
+rendered with Pillow on first request and written to
+PORTFOLIO_THUMB_CACHE_DIR. The cache evicts least recently served files
+once it grows past PORTFOLIO_THUMB_CACHE_MAX_BYTES. Concurrent first
+requests for the same thumbnail wait on a per-thumbnail lock, so it is
+rendered only once.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils._os import safe_join
+from PIL import Image, ImageOps
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still applies
+    fcntl = None
+
+
+STATIC_PREFIX = 'static/'
+STATIC_DIRS = ('images/',)
+
+# Output format by whether the thumbnail keeps an alpha channel
+OUTPUT_FORMATS = {
+    False: ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    True: ('PNG', 'png', 'image/png', {'optimize': True}),
+}
+
+
+class ThumbnailError(Exception):
+    pass
+
+
+def cache_dir():
+    return Path(getattr(settings, 'PORTFOLIO_THUMB_CACHE_DIR'))
+
+
+def max_dimension():
+    return getattr(settings, 'PORTFOLIO_THUMB_MAX_SIZE', 2000)
+
+
+def _media_dirs():
+    from .models import Project, BlogPost
+    return tuple(
+        model._meta.get_field('image').upload_to for model in (Project, BlogPost)
+    )
+
+
+def resolve_source(path):
+    """
+    Map a thumbnail ``path`` to a file on disk. Returns ``(filename, immutable)``:
+    uploads never change under the same name, static files can.
+    """
+    if path.startswith(STATIC_PREFIX):
+        relative = path[len(STATIC_PREFIX):]
+        if not relative.startswith(STATIC_DIRS):
+            raise ThumbnailError('Not a thumbnailable static file')
+        found = finders.find(relative)
+        if not found:
+            raise ThumbnailError('No such static file')
+        return found, False
+    if not path.startswith(_media_dirs()):
+        raise ThumbnailError('Not a thumbnailable upload')
+    try:
+        filename = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise ThumbnailError('Invalid path')
+    if not os.path.isfile(filename):
+        raise ThumbnailError('No such upload')
+    return filename, True
+
+
+def render_thumbnail(source, width, height):
+    """
+    Resize ``source`` to fit ``width`` x ``height``, cropping to fill both when
+    both are set (0 keeps the aspect ratio). Returns ``(bytes, content_type)``.
+    Raises ThumbnailError when ``source`` isn't an image Pillow can safely read.
+    """
+    try:
+        return _render(source, width, height)
+    except (Image.DecompressionBombError, OSError) as exc:
+        # Includes UnidentifiedImageError and truncated files
+        raise ThumbnailError(f'Unreadable image: {exc}')
+
+
+def _render(source, width, height):
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        if width and height:
+            image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+        else:
+            bound = (width or image.width, height or image.height)
+            image.thumbnail(bound, Image.Resampling.LANCZOS, reducing_gap=3.0)
+        pil_format, _ext, content_type, options = OUTPUT_FORMATS[has_alpha]
+        buffer = io.BytesIO()
+        image.save(buffer, pil_format, **options)
+        return buffer.getvalue(), content_type
+
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def thumbnail_lock(key):
+    """Serialise rendering of one thumbnail across threads and, where supported, processes."""
+    with _locks_guard:
+        lock, users = _locks.get(key, (threading.Lock(), 0))
+        _locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            # Lock files are shared by keys with the same first two hex
+            # digits and never deleted, so every process flocks the same inode
+            with open(cache_dir() / f'{key[:2]}.lock', 'w') as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+    finally:
+        with _locks_guard:
+            lock, users = _locks[key]
+            if users == 1:
+                del _locks[key]
+            else:
+                _locks[key] = (lock, users - 1)
+
+
+class ThumbnailCache:
+    """Size-bounded disk cache; file mtimes record when each entry was last served."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def key(self, source, width, height):
+        stat = os.stat(source)
+        raw = f'{source}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}'
+        return hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()
+
+    def lookup(self, key):
+        for has_alpha in (False, True):
+            _fmt, ext, content_type, _options = OUTPUT_FORMATS[has_alpha]
+            path = self.directory / f'{key}.{ext}'
+            try:
+                # Mark as recently used
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return path, content_type
+        return None
+
+    def store(self, key, data, content_type):
+        ext = next(ext for _f, ext, ctype, _o in OUTPUT_FORMATS.values() if ctype == content_type)
+        path = self.directory / f'{key}.{ext}'
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        self._grow(len(data))
+        return path
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix in ('.lock', '.tmp'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _grow(self, added):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _m, size, _p in self._entries())
+            else:
+                self._size += added
+            if self._size <= self.max_bytes:
+                return
+            # Evict down to 90% so we don't rescan on every write; the rescan
+            # also corrects for entries written or evicted by other processes
+            entries = sorted(self._entries())
+            total = sum(size for _m, size, _p in entries)
+            for _mtime, size, path in entries:
+                if total <= self.max_bytes * 0.9:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            self._size = total
+
+
+_cache = None
+_cache_guard = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_guard:
+            if _cache is None:
+                directory = cache_dir()
+                directory.mkdir(parents=True, exist_ok=True)
+                _cache = ThumbnailCache(
+                    directory, getattr(settings, 'PORTFOLIO_THUMB_CACHE_MAX_BYTES', 256 * 1024 * 1024),
+                )
+    return _cache
+
+
+def get_thumbnail(path, width, height):
+    """
+    Return ``(filename, content_type, immutable)`` for the thumbnail, rendering
+    it first if it isn't cached. Raises ThumbnailError for bad requests.
+    """
+    if not (0 <= width <= max_dimension() and 0 <= height <= max_dimension()) or not (width or height):
+        raise ThumbnailError('Unsupported size')
+    source, immutable = resolve_source(path)
+    cache = get_cache()
+    key = cache.key(source, width, height)
+    hit = cache.lookup(key)
+    if hit is None:
+        with thumbnail_lock(key):
+            # Whoever held the lock before us may have rendered it already
+            hit = cache.lookup(key)
+            if hit is None:
+                data, content_type = render_thumbnail(source, width, height)
+                hit = cache.store(key, data, content_type), content_type
+    return hit[0], hit[1], immutable
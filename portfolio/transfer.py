@@ -0,0 +1,252 @@
+"""
+NDJSON export and import of portfolio content, for backups and for moving
+data between environments (``manage.py export_content`` / ``import_content``).
+
+A file starts with a header line and then holds one JSON object per row:
+
+    {"format": "portfolio-content", "version": 1}
+    {"model": "project", "pk": 3, "fields": {...}, "technologies": ["Django", ...]}
+
+Rows are read with ``.iterator(chunk_size=...)`` and written back in chunked
+bulk_create/bulk_update calls, so memory stays flat however large the tables
+(Contact especially) are. Image fields hold storage names; given a media
+directory, the referenced files are copied out and back in alongside.
+Renditions are derived data and are not exported.
+"""
+import datetime
+import json
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, models
+from django.utils import timezone
+
+from .cache import bump_page_groups
+from .models import BlogPost, Contact, Project, ProjectTechnology, Skill, Technology
+from .search import rebuild_index
+from .snapshot import mark_snapshot_stale
+
+
+FORMAT = 'portfolio-content'
+VERSION = 1
+
+CHUNK_SIZE = 2000
+
+# Record name -> model, in export order
+CONTENT_MODELS = {
+    'skill': Skill,
+    'project': Project,
+    'blogpost': BlogPost,
+    'contact': Contact,
+}
+
+# Page cache groups to bump after importing each model
+PAGE_GROUPS = {'skill': 'skills', 'project': 'projects', 'blogpost': 'blog'}
+
+SKIP_FIELDS = {'image_renditions'}
+
+
+class ContentError(Exception):
+    pass
+
+
+def _fields(model):
+    return [f for f in model._meta.concrete_fields if not f.primary_key and f.name not in SKIP_FIELDS]
+
+
+def _file_fields(model):
+    return [f.name for f in _fields(model) if isinstance(f, models.FileField)]
+
+
+def header():
+    return {'format': FORMAT, 'version': VERSION}
+
+
+class _Encoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder rounds to milliseconds; keep the stored value
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def dumps(record):
+    return json.dumps(record, cls=_Encoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def queryset_records(name, queryset, chunk_size=CHUNK_SIZE):
+    """Yield a record per row of ``queryset``, a chunk of rows at a time."""
+    model = CONTENT_MODELS[name]
+    fields = _fields(model)
+    file_fields = set(_file_fields(model))
+    if model is Project:
+        # Prefetched per chunk when iterating
+        queryset = queryset.with_technologies()
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        record = {'model': name, 'pk': obj.pk, 'fields': {
+            f.name: (getattr(obj, f.name).name or '') if f.name in file_fields else f.value_from_object(obj)
+            for f in fields
+        }}
+        if model is Project:
+            record['technologies'] = obj.get_technologies_list()
+        yield record
+
+
+def export_records(names, chunk_size=CHUNK_SIZE):
+    """Yield a record per row of the ``names`` models."""
+    for name in names:
+        yield from queryset_records(name, CONTENT_MODELS[name].objects.order_by('pk'), chunk_size)
+
+
+def copy_media_out(record, media_dir):
+    """Copy the files ``record`` references into ``media_dir``. Returns names missing from storage."""
+    missing = []
+    for name in _file_fields(CONTENT_MODELS[record['model']]):
+        filename = record['fields'].get(name)
+        if not filename:
+            continue
+        target = Path(media_dir) / filename
+        if target.exists():
+            continue
+        if not default_storage.exists(filename):
+            missing.append(filename)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with default_storage.open(filename, 'rb') as source, open(target, 'wb') as out:
+            shutil.copyfileobj(source, out)
+    return missing
+
+
+class Importer:
+    """
+    Buffer records and write them ``chunk_size`` at a time. Rows whose pk
+    already exists are skipped, or updated with ``update=True``.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE, update=False, media_dir=None):
+        self.chunk_size = chunk_size
+        self.update = update
+        self.media_dir = Path(media_dir) if media_dir else None
+        self.pending = defaultdict(list)
+        self.created = defaultdict(int)
+        self.updated = defaultdict(int)
+        self.skipped = defaultdict(int)
+        self.missing_files = []
+        # Per-object page cache groups of the rows written
+        self.groups = set()
+
+    def add(self, record):
+        name = record.get('model') if isinstance(record, dict) else None
+        if name not in CONTENT_MODELS:
+            raise ContentError(f'Unknown record {record!r:.200}')
+        model = CONTENT_MODELS[name]
+        values = {}
+        for field in _fields(model):
+            if field.name in record.get('fields', {}):
+                try:
+                    values[field.name] = field.to_python(record['fields'][field.name])
+                except ValidationError as exc:
+                    raise ContentError(f'{name} {record.get("pk")}: {field.name}: {"; ".join(exc.messages)}')
+        obj = model(pk=record.get('pk'), **values)
+        obj._technologies = record.get('technologies')
+        self.copy_media_in(obj)
+        self.pending[name].append(obj)
+        if len(self.pending[name]) >= self.chunk_size:
+            self.flush(name)
+
+    def copy_media_in(self, obj):
+        for name in _file_fields(type(obj)):
+            filename = getattr(obj, name).name
+            if not filename or default_storage.exists(filename):
+                continue
+            source = self.media_dir / filename if self.media_dir else None
+            if source is None or not source.is_file():
+                self.missing_files.append(filename)
+                continue
+            with open(source, 'rb') as fh:
+                saved = default_storage.save(filename, File(fh))
+            setattr(obj, name, saved)
+
+    def flush(self, name):
+        objs, self.pending[name] = self.pending[name], []
+        if not objs:
+            return
+        model = CONTENT_MODELS[name]
+        existing = set(model.objects.filter(pk__in=[obj.pk for obj in objs]).values_list('pk', flat=True))
+        new = [obj for obj in objs if obj.pk not in existing]
+        old = [obj for obj in objs if obj.pk in existing]
+        auto_now = [f.attname for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+        stamps = [(obj, {name: getattr(obj, name) for name in auto_now}) for obj in new]
+        try:
+            model.objects.bulk_create(new)
+            # bulk_create() runs pre_save(), which stamps auto_now fields with
+            # the current time; a restore keeps the exported values
+            restored = []
+            for obj, values in stamps:
+                if all(value is not None for value in values.values()):
+                    for name, value in values.items():
+                        setattr(obj, name, value)
+                    restored.append(obj)
+            if auto_now and restored:
+                model.objects.bulk_update(restored, auto_now)
+            if self.update and old:
+                fields = [f.name for f in _fields(model)]
+                now = timezone.now()
+                for obj in old:
+                    # bulk_update() doesn't run pre_save(), so auto_now fields are set here
+                    for field in model._meta.concrete_fields:
+                        if getattr(field, 'auto_now', False):
+                            setattr(obj, field.attname, now)
+                model.objects.bulk_update(old, fields)
+        except IntegrityError as exc:
+            raise ContentError(f'{name}: {exc}')
+        self.created[name] += len(new)
+        if self.update:
+            self.updated[name] += len(old)
+        else:
+            self.skipped[name] += len(old)
+        written = new + (old if self.update else [])
+        if model is Project:
+            self.groups.update('project:%s' % obj.pk for obj in written)
+            self.link_technologies(written)
+        elif model is BlogPost:
+            self.groups.update('blogpost:%s' % obj.slug for obj in written)
+
+    def link_technologies(self, projects):
+        projects = [project for project in projects if project._technologies is not None]
+        if not projects:
+            return
+        names = {name for project in projects for name in project._technologies}
+        known = set(Technology.objects.filter(name__in=names).values_list('name', flat=True))
+        Technology.objects.bulk_create([Technology(name=name) for name in sorted(names - known)])
+        technology_ids = dict(Technology.objects.filter(name__in=names).values_list('name', 'pk'))
+        # No per-link signals mid-import: finish() reindexes once
+        ProjectTechnology.objects.filter(project__in=[project.pk for project in projects]).delete_unsignalled()
+        ProjectTechnology.objects.bulk_create([
+            ProjectTechnology(project_id=project.pk, technology_id=technology_ids[name], position=position)
+            for project in projects
+            for position, name in enumerate(dict.fromkeys(project._technologies))
+        ])
+
+    def finish(self):
+        """Write what is still buffered and refresh what the skipped model signals would have."""
+        for name in list(self.pending):
+            self.flush(name)
+        changed = [name for name in CONTENT_MODELS if self.created[name] or self.updated[name]]
+        if not changed:
+            return
+        # Explicit pks leave sequences behind on PostgreSQL and Oracle
+        statements = connection.ops.sequence_reset_sql(no_style(), [CONTENT_MODELS[name] for name in changed])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+        mark_snapshot_stale()
+        bump_page_groups(*(PAGE_GROUPS[name] for name in changed if name in PAGE_GROUPS), *self.groups)
+        if 'project' in changed or 'blogpost' in changed:
+            rebuild_index()
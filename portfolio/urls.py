@@ -1,15 +1,37 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, async_views
+
+if getattr(settings, 'PORTFOLIO_ASYNC_VIEWS', False):
+    HomeView = async_views.AsyncHomeView
+    ProjectsView = async_views.AsyncProjectsView
+    ProjectDetailView = async_views.AsyncProjectDetailView
+    ContactView = async_views.AsyncContactView
+    BlogListView = async_views.AsyncBlogListView
+    BlogDetailView = async_views.AsyncBlogDetailView
+else:
+    HomeView = views.HomeView
+    ProjectsView = views.ProjectsView
+    ProjectDetailView = views.ProjectDetailView
+    ContactView = views.ContactView
+    BlogListView = views.BlogListView
+    BlogDetailView = views.BlogDetailView
 
 app_name = 'portfolio'
 
 urlpatterns = [
-    path('', views.HomeView.as_view(), name='home'),
+    path('', HomeView.as_view(), name='home'),
     path('about/', views.AboutView.as_view(), name='about'),
-    path('projects/', views.ProjectsView.as_view(), name='projects'),
-    path('projects/<int:pk>/', views.ProjectDetailView.as_view(), name='project_detail'),
+    path('projects/', ProjectsView.as_view(), name='projects'),
+    path('projects/<int:pk>/', ProjectDetailView.as_view(), name='project_detail'),
     path('skills/', views.SkillsView.as_view(), name='skills'),
-    path('contact/', views.ContactView.as_view(), name='contact'),
-    path('blog/', views.BlogListView.as_view(), name='blog_list'),
-    path('blog/<slug:slug>/', views.BlogDetailView.as_view(), name='blog_detail'),
+    path('skills/summary.json', views.SkillsSummaryView.as_view(), name='skills_summary'),
+    path('contact/', ContactView.as_view(), name='contact'),
+    path('blog/', BlogListView.as_view(), name='blog_list'),
+    path('blog/<slug:slug>/', BlogDetailView.as_view(), name='blog_detail'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path(
+        settings.MEDIA_URL.strip('/') + '/thumb/<int:width>x<int:height>/<path:path>',
+        views.ThumbnailView.as_view(), name='thumbnail',
+    ),
 ]
@@ -0,0 +1,148 @@
+"""
+Self-hosted copies of the front-end libraries base.html loads from CDNs.
+
+``manage.py vendor_assets`` downloads the pinned files in SOURCES and keeps
+only the Font Awesome icons the site uses. It then writes two concatenated
+files, ``static/vendor/vendor.css`` and ``static/vendor/vendor.js``, plus
+the fonts they reference. The manifest static storage gives them
+content-hashed names at collectstatic time. base.html keeps using the CDNs
+until the vendored files exist.
+"""
+import io
+import re
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.template import engines
+
+
+VENDOR_DIR = 'vendor'
+VENDOR_CSS = 'vendor/vendor.css'
+VENDOR_JS = 'vendor/vendor.js'
+
+BOOTSTRAP = 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/'
+FONT_AWESOME = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/'
+AOS = 'https://unpkg.com/aos@2.3.1/dist/'
+
+# Download name -> pinned URL
+SOURCES = {
+    'bootstrap.min.css': BOOTSTRAP + 'css/bootstrap.min.css',
+    'bootstrap.bundle.min.js': BOOTSTRAP + 'js/bootstrap.bundle.min.js',
+    'fontawesome.min.css': FONT_AWESOME + 'css/all.min.css',
+    'fa-solid-900.woff2': FONT_AWESOME + 'webfonts/fa-solid-900.woff2',
+    'fa-regular-400.woff2': FONT_AWESOME + 'webfonts/fa-regular-400.woff2',
+    'fa-brands-400.woff2': FONT_AWESOME + 'webfonts/fa-brands-400.woff2',
+    'aos.css': AOS + 'aos.css',
+    'aos.js': AOS + 'aos.js',
+    'ndot57.ttf': 'https://cdn.shopify.com/s/files/1/0584/0932/0622/t/1/assets/fonts-ndot57.ttf',
+}
+
+# Concatenation order, as in base.html
+CSS_PARTS = ('bootstrap.min.css', 'fontawesome.min.css', 'aos.css')
+JS_PARTS = ('bootstrap.bundle.min.js', 'aos.js')
+ICON_FONTS = ('fa-solid-900.woff2', 'fa-regular-400.woff2', 'fa-brands-400.woff2')
+
+NDOT57_FACE = (
+    '@font-face{font-family:"ndot57";src:url(fonts/ndot57.ttf) format("truetype");'
+    'font-weight:normal;font-style:normal;font-display:swap}'
+)
+
+ICON_RE = re.compile(r'\bfa-[a-z0-9]+(?:-[a-z0-9]+)*')
+SCANNED_SUFFIXES = ('.html', '.js', '.css', '.py', '.json', '.yaml', '.yml')
+
+_GLYPH_RULE_RE = re.compile(r'([^{}]+)\{content:"([^"]*)"\}')
+_GLYPH_SELECTOR_RE = re.compile(r'^\.(fa-[a-z0-9-]+)::?(?:before|after)$')
+_FONT_FACE_RE = re.compile(r'@font-face\{[^}]*\}')
+_CHARSET_RE = re.compile(r'@charset "[^"]*";')
+_SOURCE_MAP_RE = re.compile(r'/\*# sourceMappingURL=[^*]*\*/|^//# sourceMappingURL=.*$', re.MULTILINE)
+
+
+def vendor_root():
+    return Path(settings.STATICFILES_DIRS[0]) / VENDOR_DIR
+
+
+def used_icons(values=()):
+    """
+    ``fa-*`` class names in the templates, the project's static files and
+    the portfolio app's sources, plus any found in ``values`` (e.g. the
+    ``icon_class`` column of Skill).
+    """
+    roots = [Path(directory) for engine in engines.all() for directory in engine.template_dirs]
+    roots += [Path(directory) for directory in settings.STATICFILES_DIRS]
+    roots.append(Path(apps.get_app_config('portfolio').path))
+    icons = set()
+    for root in roots:
+        for path in root.rglob('*'):
+            if path.suffix not in SCANNED_SUFFIXES or path.relative_to(root).parts[0] == VENDOR_DIR:
+                continue
+            icons.update(ICON_RE.findall(path.read_text(errors='ignore')))
+    for value in values:
+        icons.update(ICON_RE.findall(value or ''))
+    return icons
+
+
+def _codepoints(content):
+    if len(content) == 1:
+        return {ord(content)}
+    return {int(code, 16) for code in re.findall(r'\\([0-9a-fA-F]{1,6})', content)}
+
+
+def subset_fontawesome(css, icons, fonts=ICON_FONTS):
+    """
+    Drop the glyph rules (``.fa-house:before{content:"\\f015"}``) of icons
+    not in ``icons`` (None keeps them all), and point the @font-face rules
+    at the local WOFF2 files in ``fonts``, dropping the others. Returns
+    ``(css, codepoints)``, the codepoints being those of the glyphs kept.
+    """
+    codepoints = set()
+
+    def glyph(match):
+        selectors = []
+        for selector in match.group(1).split(','):
+            icon = _GLYPH_SELECTOR_RE.match(selector.strip())
+            if icon is None or icons is None or icon.group(1) in icons:
+                selectors.append(selector)
+        if not selectors:
+            return ''
+        codepoints.update(_codepoints(match.group(2)))
+        return '%s{content:"%s"}' % (','.join(selectors), match.group(2))
+
+    def face(match):
+        woff2 = re.search(r'url\(\.\./webfonts/([^)]+\.woff2)\)', match.group(0))
+        if woff2 is None or woff2.group(1) not in fonts:
+            return ''
+        return re.sub(r'src:[^;}]*', 'src:url(webfonts/%s) format("woff2")' % woff2.group(1), match.group(0))
+
+    css = _GLYPH_RULE_RE.sub(glyph, css)
+    css = _FONT_FACE_RE.sub(face, css)
+    return css, codepoints
+
+
+def subset_font(data, codepoints):
+    """
+    Subset a WOFF2 icon font to ``codepoints``. Needs the optional
+    ``fonttools`` and ``brotli`` packages; without them the font is returned
+    whole.
+    """
+    try:
+        from fontTools.subset import Options, Subsetter
+        from fontTools.ttLib import TTFont
+        font = TTFont(io.BytesIO(data))
+    except ImportError:
+        return data
+    options = Options()
+    options.flavor = 'woff2'
+    subsetter = Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = 'woff2'
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue()
+
+
+def concatenate(parts, charset=False):
+    """Join CSS or JS sources, without the source map links that point at files we don't ship."""
+    body = '\n'.join(_SOURCE_MAP_RE.sub('', _CHARSET_RE.sub('', part) if charset else part).strip() for part in parts)
+    return ('@charset "UTF-8";\n' + body if charset else body) + '\n'
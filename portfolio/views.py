@@ -1,105 +1,152 @@
+import hashlib
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
+from django.views import View
 from django.views.generic import TemplateView, ListView, DetailView, FormView
 from django.contrib import messages
 from django.urls import reverse_lazy
-from django.core.mail import send_mail
 from django.conf import settings
-from django.http import JsonResponse
-from .models import Project, Skill, BlogPost, Contact, SiteConfiguration
+from django.db import transaction
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from .models import Project, BlogPost, Contact
 from .forms import ContactForm
+from .pagination import CursorPaginationMixin
+from .search import search
+from .outbox import queue_contact_notification
+from .ingest import get_ingestor
+from .cache import get_site_configuration, PageCacheMixin, ConditionalGetMixin
+from .skills import get_skills_summary
+from .snapshot import snapshot_outdated
+from .thumbnails import ThumbnailError, get_thumbnail
 
 
-class HomeView(TemplateView):
+class HomeView(PageCacheMixin, ConditionalGetMixin, TemplateView):
     template_name = 'portfolio/home.html'
+    page_cache_groups = ['projects']
+    
+    def get_conditional_queryset(self):
+        return Project.objects.filter(featured=True)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['featured_projects'] = Project.objects.filter(featured=True)[:3]
-        context['config'] = SiteConfiguration.objects.first()
+        context['featured_projects'] = Project.objects.filter(featured=True).with_technologies()[:3]
         return context
 
 
-class AboutView(TemplateView):
+class AboutView(PageCacheMixin, TemplateView):
     template_name = 'portfolio/about.html'
+    page_cache_groups = ['skills']
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['skills'] = Skill.objects.all()
-        context['config'] = SiteConfiguration.objects.first()
+        summary = get_skills_summary()
+        context['skills_summary'] = summary
+        context['skills'] = [
+            dict(skill, category=category['key'])
+            for category in summary['categories'] for skill in category['skills']
+        ]
         return context
 
 
-class ProjectsView(ListView):
+class ProjectsView(PageCacheMixin, ConditionalGetMixin, CursorPaginationMixin, ListView):
     model = Project
     template_name = 'portfolio/projects.html'
     context_object_name = 'projects'
     paginate_by = 9
+    cursor_ordering = ['-featured', '-created_at', 'id']
+    page_cache_groups = ['projects']
     
     def get_queryset(self):
-        queryset = Project.objects.all()
+        queryset = Project.objects.with_technologies()
         category = self.request.GET.get('category')
         if category and category != 'all':
             queryset = queryset.filter(category=category)
+        tech = self.request.GET.get('tech')
+        if tech:
+            queryset = queryset.filter(technologies__name=tech)
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['categories'] = Project.CATEGORY_CHOICES
         context['current_category'] = self.request.GET.get('category', 'all')
+        context['current_tech'] = self.request.GET.get('tech', '')
         return context
 
 
-class ProjectDetailView(DetailView):
+class ProjectDetailView(PageCacheMixin, ConditionalGetMixin, DetailView):
     model = Project
     template_name = 'portfolio/project_detail.html'
     context_object_name = 'project'
+    
+    def get_queryset(self):
+        return Project.objects.with_technologies()
+    
+    def get_page_cache_groups(self):
+        return super().get_page_cache_groups() + ['project:%s' % self.kwargs['pk']]
+    
+    def get_conditional_queryset(self):
+        return self.get_queryset().filter(pk=self.kwargs['pk'])
 
 
-class SkillsView(TemplateView):
+class SkillsView(PageCacheMixin, TemplateView):
     template_name = 'portfolio/skills.html'
+    page_cache_groups = ['skills']
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        skills_by_category = {}
-        for skill in Skill.objects.all():
-            if skill.category not in skills_by_category:
-                skills_by_category[skill.category] = []
-            skills_by_category[skill.category].append(skill)
-        context['skills_by_category'] = skills_by_category
+        summary = get_skills_summary()
+        context['skills_summary'] = summary
+        context['skills_by_category'] = {
+            category['key']: category['skills'] for category in summary['categories']
+        }
         return context
 
 
+class SkillsSummaryView(View):
+    """
+    The skills summary as compact JSON for the skills page's script. The page
+    links to it with ``?v=<version>``, and a URL naming the current version is
+    cached by the browser for good.
+    """
+
+    def get(self, request):
+        summary = get_skills_summary()
+        body = json.dumps(summary, separators=(',', ':'))
+        etag = quote_etag(hashlib.md5(body.encode(), usedforsecurity=False).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response.headers['ETag'] = etag
+        if (
+            summary['version'] is not None
+            and request.GET.get('v') == str(summary['version'])
+            # Possibly read from before that version's save; revalidate instead
+            and not snapshot_outdated()
+        ):
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            response.headers['Cache-Control'] = 'public, max-age=0, must-revalidate'
+        return response
+
+
 class ContactView(FormView):
     template_name = 'portfolio/contact.html'
     form_class = ContactForm
     success_url = reverse_lazy('contact')
     
     def form_valid(self, form):
-        # Save contact message
-        contact = Contact(
-            name=form.cleaned_data['name'],
-            email=form.cleaned_data['email'],
-            subject=form.cleaned_data['subject'],
-            message=form.cleaned_data['message']
-        )
-        contact.save()
-        
-        # Send email notification (optional)
-        try:
-            config = SiteConfiguration.objects.first()
-            if config and config.email:
-                send_mail(
-                    subject=f"Portfolio Contact: {form.cleaned_data['subject']}",
-                    message=f"Name: {form.cleaned_data['name']}\n"
-                           f"Email: {form.cleaned_data['email']}\n"
-                           f"Message: {form.cleaned_data['message']}",
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[config.email],
-                    fail_silently=True,
-                )
-        except Exception:
-            pass
-        
+        if getattr(settings, 'PORTFOLIO_CONTACT_BATCHING', False):
+            # Journaled now, written to the database with the next batch
+            get_ingestor().submit(form.cleaned_data)
+        else:
+            self.save_contact(form)
+        return self.submitted(form)
+    
+    def submitted(self, form):
         messages.success(self.request, 'Your message has been sent successfully!')
         
         if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -107,28 +154,87 @@ class ContactView(FormView):
         
         return super().form_valid(form)
     
+    def save_contact(self, form):
+        # Save the message and queue its notification together; send_outbox
+        # delivers it, so a slow mail server never holds up this request.
+        with transaction.atomic():
+            contact = Contact.objects.create(
+                name=form.cleaned_data['name'],
+                email=form.cleaned_data['email'],
+                subject=form.cleaned_data['subject'],
+                message=form.cleaned_data['message']
+            )
+            config = get_site_configuration()
+            if config and config.email:
+                queue_contact_notification(contact, config.email)
+        return contact
+    
     def form_invalid(self, form):
         if self.request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return JsonResponse({'success': False, 'errors': form.errors})
         return super().form_invalid(form)
 
 
-class BlogListView(ListView):
+class BlogListView(PageCacheMixin, ConditionalGetMixin, CursorPaginationMixin, ListView):
     model = BlogPost
     template_name = 'portfolio/blog_list.html'
     context_object_name = 'posts'
     paginate_by = 6
+    cursor_ordering = ['-created_at', 'id']
+    page_cache_groups = ['blog']
     
     def get_queryset(self):
         return BlogPost.objects.filter(published=True)
 
 
-class BlogDetailView(DetailView):
+class BlogDetailView(PageCacheMixin, ConditionalGetMixin, DetailView):
     model = BlogPost
     template_name = 'portfolio/blog_detail.html'
     context_object_name = 'post'
     slug_field = 'slug'
     slug_url_kwarg = 'slug'
     
+    def get_page_cache_groups(self):
+        return super().get_page_cache_groups() + ['blogpost:%s' % self.kwargs['slug']]
+    
+    def get_conditional_queryset(self):
+        return self.get_queryset().filter(slug=self.kwargs['slug'])
+    
     def get_queryset(self):
         return BlogPost.objects.filter(published=True)
+
+
+class SearchView(TemplateView):
+    template_name = 'portfolio/search.html'
+    results_limit = 30
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context['query'] = query
+        context['results'] = search(query, limit=self.results_limit) if query else []
+        return context
+
+
+class ThumbnailView(View):
+    """Serve /media/thumb/<w>x<h>/<path>, rendering the thumbnail on first request."""
+    
+    def get(self, request, width, height, path):
+        try:
+            filename, content_type, immutable = get_thumbnail(path, width, height)
+            try:
+                fh = open(filename, 'rb')
+            except FileNotFoundError:
+                # Evicted between lookup and open; render it again
+                filename, content_type, immutable = get_thumbnail(path, width, height)
+                fh = open(filename, 'rb')
+        except ThumbnailError:
+            raise Http404('No such thumbnail')
+        response = FileResponse(fh, content_type=content_type)
+        if immutable:
+            response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        else:
+            # Static sources can be replaced under the same name
+            response['Cache-Control'] = 'public, max-age=86400'
+        return response
+
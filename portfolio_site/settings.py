@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,12 +45,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'portfolio.middleware.PrecompressedMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portfolio.middleware.SnapshotReadsMiddleware',
 ]
 
 ROOT_URLCONF = 'portfolio_site.urls'
@@ -58,12 +61,21 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'portfolio.context_processors.site_configuration',
+            ],
+            # Compiled templates are kept for the life of the process in every
+            # environment; runserver's autoreloader resets them on edits.
+            # `manage.py profile_templates` shows where render time goes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -79,7 +91,42 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Keep connections (and their page cache and mmap) across requests
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Take the write lock at BEGIN so writers queue on busy_timeout
+            # instead of failing on a read-to-write lock upgrade
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # In-memory copies of the public content tables, refreshed from
+    # 'default' (see portfolio/snapshot.py). Two, so a refresh can fill one
+    # while requests read the other.
+    'snapshot_a': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:portfolio_snapshot_a?mode=memory&cache=shared',
+        'TEST': {'MIRROR': 'default'},
+    },
+    'snapshot_b': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:portfolio_snapshot_b?mode=memory&cache=shared',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['portfolio.routers.SnapshotRouter']
+
+# Per-connection SQLite pragmas (see portfolio/sqlite.py for the defaults).
+# journal_mode=wal is persistent: once set, the database file stays in WAL.
+PORTFOLIO_SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+    'foreign_keys': 'on',
 }
 
 
@@ -118,14 +165,123 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    # Template bundles written to STATIC_ROOT/bundles (portfolio/bundles.py)
+    'portfolio.bundles.BundleFinder',
+]
+
+# Hashed names for far-future caching, plus .gz/.br siblings of every file
+# (portfolio/storage.py). Brotli needs the optional ``brotli`` package.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'portfolio.storage.CompressedManifestStaticFilesStorage'},
+}
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Caches
+# Page versions, the shared SiteConfiguration and the snapshot generation must
+# be seen by every worker process, so the default cache is on disk rather than
+# Django's per-process LocMemCache (see the portfolio.W001 check). Memcached or
+# Redis work as well.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'var' / 'cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Portfolio caching
+# SiteConfiguration is cached per process for PORTFOLIO_CONFIG_LOCAL_TTL
+# seconds and, if PORTFOLIO_CONFIG_CACHE names a cache alias, shared across
+# processes through that cache as well.
+PORTFOLIO_CONFIG_CACHE = 'default'
+PORTFOLIO_CONFIG_CACHE_TIMEOUT = 60 * 60
+PORTFOLIO_CONFIG_LOCAL_TTL = 5
+
+# Rendered public pages are cached in PORTFOLIO_PAGE_CACHE (set to None to
+# disable) and purged by model signals, so the timeout is only a backstop.
+PORTFOLIO_PAGE_CACHE = 'default'
+PORTFOLIO_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Paginate project and blog listings by keyset cursor (?cursor=) instead of
+# ?page= offsets. Cursor URLs work either way; this switches the first page.
+PORTFOLIO_CURSOR_PAGINATION = False
+
+# Contact notifications are queued in the outbox and delivered by
+# `manage.py send_outbox --loop`, retrying with exponential backoff.
+PORTFOLIO_OUTBOX_BATCH_SIZE = 50
+PORTFOLIO_OUTBOX_MAX_ATTEMPTS = 8
+PORTFOLIO_OUTBOX_RETRY_DELAY = 30
+PORTFOLIO_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+# Async contact view only: start delivery in the background right away
+PORTFOLIO_OUTBOX_SEND_ON_SUBMIT = True
+
+# Batch contact form writes: submissions are journaled to disk, queued in
+# memory and inserted together every BATCH_INTERVAL_MS or BATCH_MAX_ROWS.
+PORTFOLIO_CONTACT_BATCHING = False
+PORTFOLIO_CONTACT_BATCH_MAX_ROWS = 100
+PORTFOLIO_CONTACT_BATCH_INTERVAL_MS = 200
+PORTFOLIO_CONTACT_JOURNAL_DIR = BASE_DIR / 'var' / 'contact-journal'
+PORTFOLIO_CONTACT_JOURNAL_FSYNC = True
+
+# `manage.py archive_contacts` moves read messages older than ARCHIVE_DAYS
+# into monthly gzipped NDJSON files, which the admin browses on demand.
+PORTFOLIO_CONTACT_ARCHIVE_DIR = BASE_DIR / 'var' / 'contact-archive'
+PORTFOLIO_CONTACT_ARCHIVE_DAYS = 180
+
+# Admin changelists (portfolio/changelist.py) count exactly up to
+# EXACT_COUNT_LIMIT rows; past it they use the table's estimated row count or
+# an exact count cached in PORTFOLIO_ADMIN_COUNT_CACHE for COUNT_CACHE_TIMEOUT.
+PORTFOLIO_ADMIN_EXACT_COUNT_LIMIT = 10000
+PORTFOLIO_ADMIN_COUNT_CACHE = 'default'
+PORTFOLIO_ADMIN_COUNT_CACHE_TIMEOUT = 60
+
+# Serve public page reads from the in-memory snapshot. Saves refresh it in
+# every process (through the generation kept in PORTFOLIO_SNAPSHOT_CACHE,
+# which each process reads every POLL_INTERVAL seconds at most); MAX_AGE
+# bounds staleness from writes made outside Django.
+PORTFOLIO_SNAPSHOT_READS = True
+PORTFOLIO_SNAPSHOT_CACHE = 'default'
+PORTFOLIO_SNAPSHOT_POLL_INTERVAL = 1
+PORTFOLIO_SNAPSHOT_MAX_AGE = 60
+
+# Route the public pages to the native async views in portfolio/async_views.py.
+# portfolio_site/asgi.py turns this on; under WSGI the sync views are faster.
+PORTFOLIO_ASYNC_VIEWS = os.environ.get('PORTFOLIO_ASYNC_VIEWS', '') == '1'
+
+# Responsive image renditions (portfolio/images.py), built by a background
+# thread pool after each upload and by `manage.py build_image_renditions`.
+PORTFOLIO_IMAGE_WIDTHS = [320, 640, 960, 1280, 1920]
+PORTFOLIO_IMAGE_FORMATS = ['avif', 'webp', 'jpeg']
+PORTFOLIO_IMAGE_WORKERS = 2
+PORTFOLIO_IMAGE_BACKGROUND = True
+
+# On-demand thumbnails (/media/thumb/<w>x<h>/<path>), cached on disk and
+# evicted least-recently-served first once the cache passes MAX_BYTES.
+PORTFOLIO_THUMB_CACHE_DIR = BASE_DIR / 'var' / 'thumbs'
+PORTFOLIO_THUMB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+PORTFOLIO_THUMB_MAX_SIZE = 2000
+
+# Static and media files are served by Django itself, under WSGI or ASGI
+# (portfolio/files.py): hashed static names are cached forever, everything
+# else for PORTFOLIO_FILES_MAX_AGE seconds. Turn off behind a web server
+# that serves them.
+PORTFOLIO_SERVE_FILES = True
+PORTFOLIO_FILES_MAX_AGE = 60 * 60
+
+# Target directory for `manage.py export_static`
+PORTFOLIO_EXPORT_ROOT = BASE_DIR / 'static_site'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 